@@ -0,0 +1,272 @@
+"""Headless batch OCR and translation.
+
+Streams images from directories, globs or frame dumps (e.g. the output of
+``ffmpeg -i clip.mp4 frames/%06d.png``) through OCR on a process pool and
+translation on the concurrent translation client, writing one JSON object
+per image to a JSONL file. Only a bounded number of images are in flight at
+once, and an interrupted run picks up where it left off.
+
+Usage:
+    python main.py batch screenshots/ "frames/**/*.png" -o results.jsonl --target en
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional, Set
+
+from PIL import Image
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp'}
+
+_worker_processor = None
+
+
+def iter_images(inputs: Iterable[str], recursive: bool = True) -> Iterator[str]:
+    """Yield image paths from files, directories and glob patterns, in order.
+
+    Args:
+        inputs: Paths to files or directories, or glob patterns
+        recursive: Descend into subdirectories of directory inputs
+
+    Yields:
+        Image file paths
+    """
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                        yield os.path.join(root, name)
+                if not recursive:
+                    break
+        elif os.path.isfile(item):
+            yield item
+        else:
+            for path in sorted(glob.iglob(item, recursive=True)):
+                if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+                    yield path
+
+
+def load_completed(output: str) -> Set[str]:
+    """Read the paths already written to an output file.
+
+    A partially written last line from an interrupted run is removed so new
+    results can be appended cleanly.
+
+    Args:
+        output: JSONL output path
+
+    Returns:
+        Set of input paths that already have a result
+    """
+    completed = set()
+    if not os.path.exists(output):
+        return completed
+
+    valid_size = 0
+    with open(output, 'rb') as f:
+        for line in f:
+            try:
+                completed.add(json.loads(line)['path'])
+            except (ValueError, KeyError):
+                break
+            valid_size += len(line)
+    if valid_size != os.path.getsize(output):
+        with open(output, 'rb+') as f:
+            f.truncate(valid_size)
+    return completed
+
+
+def _init_worker(lang: str, config: str, preprocess: bool):
+    """Create the OCR processor used by a worker process.
+
+    Workers never translate; the processor's translation client is only
+    created on first use, so none is started here.
+    """
+    global _worker_processor
+    from ocr_processor import OCRProcessor
+    from preprocess import Preprocessor
+
+    _worker_processor = OCRProcessor(pool_size=1, lang=lang, config=config,
+                                     preprocessor=Preprocessor() if preprocess else None)
+
+
+def _ocr_file(path: str) -> dict:
+    """OCR a single image file inside a worker process."""
+    try:
+        with Image.open(path) as image:
+            text = _worker_processor.extract_text(image.convert('RGB'))
+        return {'path': path, 'text': text}
+    except Exception as e:
+        return {'path': path, 'text': '', 'error': f"ocr: {e}"}
+
+
+def translate_records(processor, records: List[dict], source_lang: str, target_lang: str):
+    """Translate the text of several records with as few requests as possible.
+
+    Args:
+        processor: OCRProcessor providing cached batch translation
+        records: Records with a 'text' field, updated in place
+        source_lang: Source language code ('auto' for auto-detect)
+        target_lang: Target language code
+
+    Returns:
+        False if the translation request failed and the records with text
+        were left untranslated
+    """
+    from incremental import join_segments, split_segments
+
+    splits = [split_segments(record['text']) if record['text'].strip() else ([], [])
+              for record in records]
+    segments = [segment for parts, _ in splits for segment in parts]
+    try:
+        results = processor.translate_batch(segments, source_lang, target_lang)
+    except Exception as e:
+        print(f"Translation failed: {e}", file=sys.stderr)
+        return False
+
+    position = 0
+    for record, (parts, separators) in zip(records, splits):
+        translated = results[position:position + len(parts)]
+        position += len(parts)
+        record['translation'] = join_segments([t for t, _ in translated], separators)
+        record['detected_lang'] = translated[0][1] if translated else ""
+    return True
+
+
+def run(inputs: List[str], output: str, source_lang: str = 'auto',
+        target_lang: Optional[str] = 'en', workers: Optional[int] = None,
+        max_in_flight: int = 64, translate_batch_size: int = 32,
+        lang: str = 'eng', config: str = '', preprocess: bool = True,
+        recursive: bool = True, resume: bool = True) -> int:
+    """Run batch OCR and translation.
+
+    Args:
+        inputs: Files, directories or glob patterns to process
+        output: JSONL file results are appended to
+        source_lang: Source language code for translation
+        target_lang: Target language code, or None to skip translation
+        workers: Number of OCR worker processes, default one per CPU
+        max_in_flight: Maximum images submitted to the OCR pool at once
+        translate_batch_size: Number of OCR results translated together
+        lang: Tesseract language code(s)
+        config: Extra Tesseract options
+        preprocess: Apply image preprocessing before OCR
+        recursive: Descend into subdirectories of directory inputs
+        resume: Skip images that already have a result in the output file
+
+    Returns:
+        Number of images processed in this run
+    """
+    from cache import TranslationCache
+    from ocr_engine import PytesseractEngine
+    from ocr_processor import OCRProcessor
+    from paths import app_path
+
+    completed = load_completed(output) if resume else set()
+    translator = None
+    if target_lang:
+        # OCR happens in the worker processes; this processor only translates
+        translator = OCRProcessor(engine=PytesseractEngine(), translation_cache=TranslationCache(
+            app_path('translations.db')))
+
+    processed = 0
+    skipped = 0
+    pending_records: List[dict] = []
+
+    with open(output, 'a' if resume else 'w', encoding='utf-8') as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(lang, config, preprocess)) as pool:
+
+        def flush():
+            nonlocal processed, skipped
+            records = pending_records
+            if translator is not None and not translate_records(
+                    translator, pending_records, source_lang, target_lang):
+                # Left out of the output so a resumed run retries them
+                records = [record for record in pending_records if not record['text'].strip()]
+                skipped += len(pending_records) - len(records)
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+            processed += len(records)
+            print(f"Processed {processed} images", file=sys.stderr)
+            pending_records.clear()
+
+        def collect(done):
+            nonlocal skipped
+            for future in done:
+                record = future.result()
+                if 'error' in record:
+                    # Left out of the output so a resumed run retries it
+                    print(f"{record['path']}: {record['error']}", file=sys.stderr)
+                    skipped += 1
+                else:
+                    pending_records.append(record)
+            if len(pending_records) >= translate_batch_size:
+                flush()
+
+        in_flight = set()
+        for path in iter_images(inputs, recursive):
+            if path in completed:
+                continue
+            completed.add(path)
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(pool.submit(_ocr_file, path))
+
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+        if pending_records:
+            flush()
+
+    if skipped:
+        print(f"{skipped} images could not be read or translated; run again to retry them",
+              file=sys.stderr)
+    return processed
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point for batch processing."""
+    parser = argparse.ArgumentParser(
+        prog='main.py batch',
+        description="OCR and translate images from directories, globs or frame dumps.")
+    parser.add_argument('inputs', nargs='+', help="image files, directories or glob patterns")
+    parser.add_argument('-o', '--output', required=True, help="JSONL file to append results to")
+    parser.add_argument('--source', default='auto', help="source language (default: auto)")
+    parser.add_argument('--target', default='en', help="target language (default: en)")
+    parser.add_argument('--no-translate', action='store_true', help="only run OCR")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="OCR worker processes (default: one per CPU)")
+    parser.add_argument('--max-in-flight', type=int, default=64,
+                        help="maximum images queued for OCR at once")
+    parser.add_argument('--batch-size', type=int, default=32,
+                        help="OCR results translated per batch")
+    parser.add_argument('--lang', default='eng', help="Tesseract language (default: eng)")
+    parser.add_argument('--config', default='', help="extra Tesseract options, e.g. '--psm 6'")
+    parser.add_argument('--no-preprocess', action='store_true',
+                        help="send images to Tesseract unchanged")
+    parser.add_argument('--no-recursive', action='store_true',
+                        help="do not descend into subdirectories")
+    parser.add_argument('--restart', action='store_true',
+                        help="overwrite the output instead of resuming")
+    args = parser.parse_args(argv)
+
+    processed = run(args.inputs, args.output, args.source,
+                    None if args.no_translate else args.target,
+                    workers=args.workers, max_in_flight=args.max_in_flight,
+                    translate_batch_size=args.batch_size, lang=args.lang,
+                    config=args.config, preprocess=not args.no_preprocess,
+                    recursive=not args.no_recursive, resume=not args.restart)
+    print(f"Done: {processed} images written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Benchmarks for the capture, OCR and translation path.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_ocr_engine``.
+"""
@@ -0,0 +1,74 @@
+"""Measure screen capture throughput of the capture backend.
+
+Runs against $DISPLAY, or starts a private Xvfb server when no display is
+set (requires the ``Xvfb`` binary):
+
+    python -m benchmarks.bench_capture [--grabs 200] [--size 1280x720]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import time
+
+from capture import create_backend
+
+
+def start_xvfb(display: str = ":99", screen: str = "1920x1080x24") -> subprocess.Popen:
+    """Start a virtual X server and point $DISPLAY at it."""
+    if shutil.which("Xvfb") is None:
+        raise SystemExit("No $DISPLAY and Xvfb is not installed")
+    server = subprocess.Popen(["Xvfb", display, "-screen", "0", screen, "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(1.0)
+    if server.poll() is not None:
+        raise SystemExit(f"Xvfb exited with status {server.returncode}")
+    return server
+
+
+def bench(backend, bbox, grabs: int):
+    """Time repeated grabs and return latencies in milliseconds."""
+    backend.grab(bbox)
+    latencies = []
+    for _ in range(grabs):
+        start = time.perf_counter()
+        frame = backend.grab(bbox)
+        frame[::4, ::4].max()  # touch the pixels like the change detector does
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies, pixels: int):
+    latencies = sorted(latencies)
+    mean = statistics.mean(latencies)
+    p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+    print(f"{name:<10} mean {mean:7.2f} ms  p95 {p95:7.2f} ms  "
+          f"{1000 / mean:7.1f} grabs/s  {pixels * 3 / mean / 1000:7.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--grabs', type=int, default=200)
+    parser.add_argument('--size', default="1280x720", help="captured rectangle, WxH")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split('x'))
+    bbox = (0, 0, width, height)
+    server = None if os.environ.get("DISPLAY") else start_xvfb()
+    try:
+        backend = create_backend()
+        try:
+            report(backend.name, bench(backend, bbox, args.grabs), width * height)
+        finally:
+            backend.close()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare per-call OCR latency of the pytesseract and pooled engines.
+
+pytesseract is measured when the tesseract command is installed, the pooled
+engines when tesserocr or libtesseract can be loaded.
+
+Usage:
+    python -m benchmarks.bench_ocr_engine [--calls 20] [--pool-size 2]
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.synthetic import random_frames
+from ocr_engine import (LibtesseractPoolEngine, PytesseractEngine, TesserocrPoolEngine,
+                        tesserocr_available)
+
+
+def bench(engine, frames, calls: int):
+    """Time repeated recognize calls and return latencies in milliseconds."""
+    engine.recognize(frames[0][0])
+    latencies = []
+    for i in range(calls):
+        image, _ = frames[i % len(frames)]
+        start = time.perf_counter()
+        engine.recognize(image)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+    print(f"{name:<12} mean {statistics.mean(latencies):8.1f} ms  "
+          f"p50 {statistics.median(latencies):8.1f} ms  p95 {p95:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--pool-size', type=int, default=2)
+    args = parser.parse_args()
+
+    frames = random_frames(8)
+    try:
+        report("pytesseract", bench(PytesseractEngine(), frames, args.calls))
+    except Exception as e:
+        print(f"pytesseract  unavailable: {e}")
+
+    engines = [LibtesseractPoolEngine]
+    if tesserocr_available():
+        engines.insert(0, TesserocrPoolEngine)
+    else:
+        print("tesserocr    not installed, skipping its pool")
+    for engine_class in engines:
+        try:
+            engine = engine_class(pool_size=args.pool_size)
+        except Exception as e:
+            print(f"{engine_class.name:<12} unavailable: {e}")
+            continue
+        try:
+            report(engine.name, bench(engine, frames, args.calls))
+        finally:
+            engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""End-to-end benchmark of the capture-to-translation path.
+
+Feeds synthetic rendered-text frames through the real ProcessingPipeline,
+with translation served by the local stub server, and reports frames per
+second, end-to-end latency and the per-stage breakdown collected by the
+metrics hooks. Micro-benchmarks of the per-frame stages (change detection,
+preprocessing, pixel hashing, text-block layout) run first.
+
+Results can be saved as JSON and compared against an earlier run to catch
+regressions:
+
+    python -m benchmarks.bench_pipeline --json base.json
+    python -m benchmarks.bench_pipeline --baseline base.json
+
+Use --fake-ocr on machines without Tesseract; OCR is then replaced by a
+fixed delay returning the ground-truth text.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.stub_translate_server import start_stub_server
+from benchmarks.synthetic import random_frames
+from cache import image_digest
+from change_detector import ChangeDetector
+from metrics import metrics
+from ocr_engine import OCREngine, create_engine
+from ocr_processor import OCRProcessor
+from pipeline import ProcessingPipeline
+from preprocess import Preprocessor
+from tiling import find_text_blocks
+from translation_client import TranslationClient
+
+# Metrics compared against a baseline; all are "lower is better"
+REGRESSION_KEYS = ['end_to_end_p50', 'end_to_end_p95', 'change_detect_us',
+                   'preprocess_ms', 'digest_ms', 'layout_ms']
+
+
+class FakeOCREngine(OCREngine):
+    """Returns ground-truth text after a fixed delay."""
+
+    name = "fake"
+
+    def __init__(self, truths, delay: float):
+        self.truths = truths
+        self.delay = delay
+
+    def recognize(self, image, lang='eng', config=''):
+        time.sleep(self.delay)
+        return self.truths.get(image_digest(image), "")
+
+
+def micro_benchmarks(repeat: int = 50) -> dict:
+    """Time the per-frame stages that run on every capture."""
+    frame = np.full((1080, 1920, 3), 235, dtype=np.uint8)
+    detector = ChangeDetector()
+    detector.detect(frame)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        detector.detect(frame)
+    change_us = (time.perf_counter() - start) / repeat * 1e6
+
+    text_frame, _ = random_frames(1, lines_per_frame=6)[0]
+    preprocessor = Preprocessor()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        preprocessor.process(text_frame)
+    preprocess_ms = (time.perf_counter() - start) / repeat * 1000
+
+    image = Image.fromarray(frame)
+    start = time.perf_counter()
+    for _ in range(repeat // 5 or 1):
+        image_digest(image)
+    digest_ms = (time.perf_counter() - start) / (repeat // 5 or 1) * 1000
+
+    image.paste(text_frame, (100, 100))
+    start = time.perf_counter()
+    for _ in range(repeat // 5 or 1):
+        find_text_blocks(image)
+    layout_ms = (time.perf_counter() - start) / (repeat // 5 or 1) * 1000
+
+    return {'change_detect_us': round(change_us, 1), 'preprocess_ms': round(preprocess_ms, 2),
+            'digest_ms': round(digest_ms, 2), 'layout_ms': round(layout_ms, 2)}
+
+
+def pipeline_benchmark(frames: int, fps: float, latency: float, fake_ocr: bool,
+                       ocr_delay: float) -> dict:
+    """Push frames through the pipeline at a fixed rate and measure throughput."""
+    samples = random_frames(frames, seed=1)
+    server, _ = start_stub_server(latency=latency)
+    client = TranslationClient(server.url, rate=None)
+    if fake_ocr:
+        engine = FakeOCREngine({image_digest(image): text for image, text in samples}, ocr_delay)
+    else:
+        engine = create_engine()
+    processor = OCRProcessor(engine=engine, translation_client=client)
+
+    done = threading.Event()
+    completed = []
+    unchanged = []
+
+    def check_done():
+        if len(completed) + len(unchanged) + pipeline.dropped_frames >= frames:
+            done.set()
+
+    def on_translation(job, translation, lang, target):
+        completed.append(time.perf_counter() - job.submitted_at)
+        check_done()
+
+    def on_skip(job):
+        unchanged.append(job)
+        check_done()
+
+    pipeline = ProcessingPipeline(processor, on_ocr=lambda job, text: None,
+                                  on_translation=on_translation,
+                                  on_error=lambda job, stage, e, target: print(f"{stage} error: {e}"),
+                                  on_skip=on_skip)
+    pipeline.set_languages('auto', 'es')
+    pipeline.start()
+
+    metrics.reset()
+    start = time.perf_counter()
+    for image, _ in samples:
+        pipeline.submit(image)
+        time.sleep(1.0 / fps)
+    done.wait(timeout=60)
+    elapsed = time.perf_counter() - start
+    pipeline.stop()
+    server.shutdown()
+    client.close()
+
+    completed.sort()
+    result = {
+        'frames': frames,
+        'translated': len(completed),
+        'dropped': pipeline.dropped_frames,
+        'unchanged': len(unchanged),
+        'fps': round(len(completed) / elapsed, 2),
+        'requests': server.request_count,
+    }
+    if completed:
+        result['end_to_end_p50'] = round(completed[len(completed) // 2] * 1000, 1)
+        result['end_to_end_p95'] = round(
+            completed[min(int(len(completed) * 0.95), len(completed) - 1)] * 1000, 1)
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return descriptions of metrics that got worse than the baseline."""
+    regressions = []
+    for key in REGRESSION_KEYS:
+        if key in results and key in baseline and baseline[key]:
+            ratio = results[key] / baseline[key]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{key}: {baseline[key]} -> {results[key]} ({ratio:.2f}x)")
+    if 'fps' in baseline and results.get('fps', 0) < baseline['fps'] * (1 - tolerance):
+        regressions.append(f"fps: {baseline['fps']} -> {results.get('fps')}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=40)
+    parser.add_argument('--fps', type=float, default=10.0, help="rate frames are submitted at")
+    parser.add_argument('--latency', type=float, default=0.05, help="stub translation latency (s)")
+    parser.add_argument('--fake-ocr', action='store_true', help="replace Tesseract with a fixed delay")
+    parser.add_argument('--ocr-delay', type=float, default=0.08, help="delay for --fake-ocr (s)")
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--baseline', help="compare against results from an earlier run")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed relative slowdown before reporting a regression")
+    args = parser.parse_args()
+
+    results = micro_benchmarks()
+    results.update(pipeline_benchmark(args.frames, args.fps, args.latency,
+                                      args.fake_ocr, args.ocr_delay))
+    results['stages'] = metrics.snapshot()['stages']
+
+    for key, value in results.items():
+        if key != 'stages':
+            print(f"{key:<20}{value}")
+    print()
+    print(metrics.format_table())
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Measure OCR time and accuracy with and without preprocessing.
+
+Synthetic frames cover dark-on-light, light-on-dark, coloured and small
+text with known ground truth; accuracy is the character-level similarity
+to that ground truth. Screenshots in assets/ have no ground truth, so only
+their OCR time and extracted length are reported.
+
+Usage:
+    python -m benchmarks.bench_preprocess
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import time
+
+from PIL import Image
+
+from benchmarks.synthetic import SAMPLE_LINES, render_text
+from ocr_engine import create_engine
+from preprocess import Preprocessor
+
+SYNTHETIC_STYLES = {
+    'dark-on-light': dict(font_size=24),
+    'light-on-dark': dict(font_size=24, fg=(235, 235, 235), bg=(25, 25, 40)),
+    'coloured': dict(font_size=22, fg=(250, 210, 60), bg=(60, 90, 140)),
+    'small': dict(font_size=11),
+    'small-light-on-dark': dict(font_size=11, fg=(220, 220, 220), bg=(10, 10, 10)),
+}
+
+
+def accuracy(expected: str, actual: str) -> float:
+    """Character-level similarity ignoring whitespace differences."""
+    return difflib.SequenceMatcher(None, " ".join(expected.split()),
+                                   " ".join(actual.split())).ratio()
+
+
+def timed_ocr(engine, image, preprocessor=None):
+    start = time.perf_counter()
+    if preprocessor is not None:
+        image = preprocessor.process(image)
+    text = engine.recognize(image)
+    return text, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--assets', default='assets')
+    args = parser.parse_args()
+
+    engine = create_engine()
+    preprocessor = Preprocessor()
+    print(f"{'input':<28}{'raw ms':>9}{'raw acc':>9}{'prep ms':>9}{'prep acc':>9}")
+
+    lines = SAMPLE_LINES[:4]
+    truth = "\n".join(lines)
+    for name, style in SYNTHETIC_STYLES.items():
+        image = render_text(lines, **style)
+        raw_text, raw_ms = timed_ocr(engine, image)
+        prep_text, prep_ms = timed_ocr(engine, image, preprocessor)
+        print(f"{name:<28}{raw_ms:9.1f}{accuracy(truth, raw_text):9.2f}"
+              f"{prep_ms:9.1f}{accuracy(truth, prep_text):9.2f}")
+
+    for path in sorted(glob.glob(os.path.join(args.assets, '*.png'))):
+        image = Image.open(path).convert('RGB')
+        raw_text, raw_ms = timed_ocr(engine, image)
+        prep_text, prep_ms = timed_ocr(engine, image, preprocessor)
+        name = os.path.basename(path)[:26]
+        print(f"{name:<28}{raw_ms:9.1f}{len(raw_text):>8}c{prep_ms:9.1f}{len(prep_text):>8}c")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure application startup time.
+
+Each run starts a fresh interpreter and records how long it takes to import
+the GUI, to show the window and for the background warm-up to report the
+OCR engine and translator as ready. Heavy modules that were imported before
+the window appeared are listed, since startup should not pay for them.
+
+    python -m benchmarks.bench_startup [--runs 5]
+
+Without a display only the import phase is measured.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that should only be imported once OCR or translation is first used
+LAZY_MODULES = ('pytesseract', 'tesserocr', 'deep_translator', 'bs4', 'requests',
+                'PIL.ImageGrab')
+
+
+def child(timeout: float) -> dict:
+    """Start the application in this process and time each startup phase."""
+    start = time.perf_counter()
+    import tkinter as tk
+    import gui
+    result = {'import_ms': (time.perf_counter() - start) * 1000}
+    result['eager_modules'] = [name for name in LAZY_MODULES if name in sys.modules]
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return result
+    app = gui.OCRTranslatorApp(root)
+    root.update()
+    result['window_ms'] = (time.perf_counter() - start) * 1000
+
+    deadline = time.perf_counter() + timeout
+    pending = set(app.readiness)
+    while pending and time.perf_counter() < deadline:
+        root.update()
+        for name in list(pending):
+            if not app.readiness[name].endswith("..."):
+                result[f"{name.lower()}_ready_ms"] = (time.perf_counter() - start) * 1000
+                result[f"{name.lower()}_state"] = app.readiness[name]
+                pending.discard(name)
+        time.sleep(0.005)
+    app.pipeline.stop()
+    root.destroy()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="how long to wait for warm-up to finish (s)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.timeout)))
+        return
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_startup', '--child',
+             '--timeout', str(args.timeout)],
+            cwd=root_dir, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    for key in ('import_ms', 'window_ms', 'ocr_ready_ms', 'translator_ready_ms'):
+        values = [run[key] for run in runs if key in run]
+        if values:
+            print(f"{key:<22}median {statistics.median(values):8.1f}  "
+                  f"min {min(values):8.1f}  max {max(values):8.1f}")
+    for key in ('ocr_state', 'translator_state'):
+        if key in runs[-1]:
+            print(f"{key:<22}{runs[-1][key]}")
+    eager = sorted({name for run in runs for name in run['eager_modules']})
+    print(f"{'eager heavy modules':<22}{', '.join(eager) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
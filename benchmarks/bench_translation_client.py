@@ -0,0 +1,48 @@
+"""Compare serial per-segment translation with the batched concurrent client.
+
+Runs against the local stub server, so results only depend on the simulated
+latency and not on network conditions.
+
+Usage:
+    python -m benchmarks.bench_translation_client [--segments 60] [--latency 0.05]
+"""
+
+import argparse
+import time
+
+from benchmarks.stub_translate_server import start_stub_server
+from benchmarks.synthetic import SAMPLE_LINES
+from translation_client import TranslationClient
+
+
+def run(name: str, client: TranslationClient, server, segments):
+    server.request_count = 0
+    start = time.perf_counter()
+    results = client.translate_batch(segments, 'auto', 'es')
+    elapsed = time.perf_counter() - start
+    assert len(results) == len(segments)
+    print(f"{name:<24} {elapsed * 1000:8.1f} ms  {server.request_count:4d} requests")
+    client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--segments', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    server, _ = start_stub_server(latency=args.latency)
+    segments = [f"{SAMPLE_LINES[i % len(SAMPLE_LINES)]} #{i}" for i in range(args.segments)]
+    try:
+        run("serial, one per segment", TranslationClient(
+            server.url, max_chars=1, max_concurrency=1, rate=None), server, segments)
+        run("batched, 1 connection", TranslationClient(
+            server.url, max_chars=500, max_concurrency=1, rate=None), server, segments)
+        run("batched, 4 concurrent", TranslationClient(
+            server.url, max_chars=500, max_concurrency=4, rate=None), server, segments)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Local stub of the Google Translate mobile endpoint.
+
+Serves ``GET /m?sl=..&tl=..&q=..`` with the same HTML structure the real
+endpoint uses, so TranslationClient can be exercised without network
+access. The "translation" is the upper-cased text prefixed with the target
+language, and latency and rate limiting can be simulated.
+
+Usage:
+    python -m benchmarks.stub_translate_server [--port 8765] [--latency 0.05]
+"""
+
+import argparse
+import html
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+def fake_translate(text: str, target_lang: str) -> str:
+    """Deterministic stand-in translation that keeps paragraph breaks."""
+    return "\n\n".join(f"[{target_lang}] {part.upper()}" for part in text.split("\n\n"))
+
+
+class StubTranslateServer(ThreadingHTTPServer):
+    """HTTP server answering translation requests locally.
+
+    Args:
+        port: Port to listen on, 0 to pick a free one
+        latency: Seconds to wait before answering each request
+        reject_every: Answer every Nth request with HTTP 429, 0 to disable
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, reject_every: int = 0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.latency = latency
+        self.reject_every = reject_every
+        self.request_count = 0
+        self.chars_received = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to TranslationClient."""
+        return f"http://127.0.0.1:{self.server_address[1]}/m"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlparse(self.path).query)
+        text = query.get('q', [''])[0]
+        with server._lock:
+            server.request_count += 1
+            server.chars_received += len(text)
+            reject = server.reject_every and server.request_count % server.reject_every == 0
+        time.sleep(server.latency)
+
+        if reject:
+            self.send_response(429)
+            self.end_headers()
+            return
+        body = ('<html><body><div class="result-container">'
+                f'{html.escape(fake_translate(text, query.get("tl", ["en"])[0]))}'
+                '</div></body></html>').encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency: float = 0.0, reject_every: int = 0,
+                      port: int = 0) -> Tuple[StubTranslateServer, threading.Thread]:
+    """Start a stub server on a background thread.
+
+    Returns:
+        Tuple of (server, thread); call server.shutdown() when done
+    """
+    server = StubTranslateServer(port, latency, reject_every)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--reject-every', type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubTranslateServer(args.port, args.latency, args.reject_every)
+    print(f"Stub translation server listening on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""Result caches for OCR and translation.
+
+Game menus, UI labels and subtitles repeat constantly, so translations are
+kept in a two-level cache: a small in-memory LRU tier answers repeats in
+microseconds, and a SQLite tier keeps them across restarts. OCR results are
+cached in memory by a hash of the raw pixels, so a frame that was already
+read skips Tesseract entirely.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Normalise text for use as a cache key.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Text with surrounding whitespace stripped and inner runs collapsed
+    """
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class CacheStats:
+    """Hit and miss counters for a cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the counters as a plain dictionary."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hit_rate, 4),
+        }
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with optional per-entry TTL.
+
+    Args:
+        max_entries: Maximum number of entries kept
+        ttl: Seconds an entry stays valid, or None for no expiry
+        max_weight: Optional bound on the total weight of all values
+        weigh: Function giving the weight of a value, used with max_weight
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None,
+                 max_weight: Optional[int] = None,
+                 weigh: Optional[Callable[[Any], int]] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigh = weigh or (lambda value: 1)
+        self.weight = 0
+        self.stats = CacheStats()
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Look up a key, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, stored_at = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                self.weight -= self.weigh(value)
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, stored_at: Optional[float] = None):
+        """Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            stored_at: Original storage time, used when promoting entries
+                       from a slower tier so their TTL is preserved
+        """
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.weight -= self.weigh(old[0])
+            self._data[key] = (value, stored_at if stored_at is not None else time.time())
+            self.weight += self.weigh(value)
+            while len(self._data) > self.max_entries or (
+                    self.max_weight is not None and self.weight > self.max_weight
+                    and len(self._data) > 1):
+                _, (evicted, _) = self._data.popitem(last=False)
+                self.weight -= self.weigh(evicted)
+                self.stats.evictions += 1
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TranslationCache:
+    """Two-level translation cache with an LRU memory tier and a SQLite tier.
+
+    Args:
+        path: SQLite database file for the persistent tier, or None to keep
+              the cache in memory only
+        memory_entries: Maximum entries in the memory tier
+        disk_entries: Maximum entries in the disk tier
+        ttl: Seconds a translation stays valid, or None for no expiry
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_entries: int = 2048,
+                 disk_entries: int = 100000, ttl: Optional[float] = 30 * 24 * 3600):
+        self.memory = LRUCache(memory_entries, ttl)
+        self.disk_entries = disk_entries
+        self.ttl = ttl
+        self.disk_stats = CacheStats()
+        self._db = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        # Access times of disk hits, written with the next put() so a lookup
+        # never leaves a write transaction open on the shared database
+        self._accessed: Dict[Tuple[str, str, str], float] = {}
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL,"
+                " translation TEXT NOT NULL, detected TEXT NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL,"
+                " PRIMARY KEY (source, target, text))"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS translations_accessed ON translations (accessed)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, source_lang: str, target_lang: str) -> Tuple[str, str, str]:
+        """Build the cache key for a translation request."""
+        return (source_lang, target_lang, normalize_text(text))
+
+    def get(self, text: str, source_lang: str, target_lang: str) -> Optional[Tuple[str, str]]:
+        """Look up a cached translation.
+
+        Args:
+            text: Source text
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Tuple of (translated_text, detected_language), or None on a miss
+        """
+        key = self.make_key(text, source_lang, target_lang)
+        value = self.memory.get(key)
+        if value is not None or self._db is None:
+            return value
+
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT translation, detected, created FROM translations"
+                " WHERE source = ? AND target = ? AND text = ?", key
+            ).fetchone()
+            if row is None or (self.ttl is not None and now - row[2] > self.ttl):
+                self.disk_stats.misses += 1
+                return None
+            self._accessed[key] = now
+            self.disk_stats.hits += 1
+
+        value = (row[0], row[1])
+        self.memory.put(key, value, stored_at=row[2])
+        return value
+
+    def put(self, text: str, source_lang: str, target_lang: str,
+            translation: str, detected_lang: str):
+        """Store a translation in both tiers.
+
+        Args:
+            text: Source text
+            source_lang: Source language code
+            target_lang: Target language code
+            translation: Translated text
+            detected_lang: Detected source language
+        """
+        key = self.make_key(text, source_lang, target_lang)
+        self.memory.put(key, (translation, detected_lang))
+        if self._db is None:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._write_accessed()
+            self._db.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                key + (translation, detected_lang, now, now)
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune()
+            self._db.commit()
+
+    def _write_accessed(self):
+        """Record the access times of disk hits since the last write."""
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE translations SET accessed = ?"
+                " WHERE source = ? AND target = ? AND text = ?",
+                [(accessed,) + key for key, accessed in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _prune(self):
+        """Drop expired entries and trim the disk tier to its size limit."""
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM translations WHERE created < ?",
+                             (time.time() - self.ttl,))
+        count = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        excess = count - self.disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                " SELECT rowid FROM translations ORDER BY accessed LIMIT ?)", (excess,)
+            )
+            self.disk_stats.evictions += excess
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return hit/miss counters for both tiers."""
+        return {'memory': self.memory.stats.as_dict(), 'disk': self.disk_stats.as_dict()}
+
+    def close(self):
+        """Flush and close the persistent tier."""
+        if self._db is not None:
+            with self._lock:
+                self._write_accessed()
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+
+def image_digest(image: Union[Image.Image, np.ndarray]) -> str:
+    """Hash the raw pixel buffer of an image.
+
+    No encoding is involved; the pixel bytes are hashed directly together
+    with the mode and size, so identical frames always hash the same.
+
+    Args:
+        image: PIL Image or NumPy array
+
+    Returns:
+        Hex digest of the pixels
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(image, np.ndarray):
+        digest.update(f"{image.dtype}{image.shape}".encode())
+        digest.update(memoryview(np.ascontiguousarray(image)).cast('B'))
+    else:
+        digest.update(f"{image.mode}{image.size}".encode())
+        digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """Content-addressed in-memory cache of OCR results.
+
+    Args:
+        max_entries: Maximum number of cached results
+        max_chars: Maximum total characters of cached text
+    """
+
+    def __init__(self, max_entries: int = 512, max_chars: int = 2_000_000):
+        self._lru = LRUCache(max_entries, max_weight=max_chars, weigh=len)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit/miss/eviction counters."""
+        return self._lru.stats
+
+    @staticmethod
+    def make_key(image: Union[Image.Image, np.ndarray], lang: str,
+                 config: str) -> Tuple[str, str, str]:
+        """Build the cache key for an image and its OCR settings.
+
+        Args:
+            image: Image to be recognised
+            lang: Tesseract language code(s)
+            config: Everything else that affects the result, such as
+                    Tesseract options and preprocessing settings
+        """
+        return (image_digest(image), lang, config)
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[str]:
+        """Look up the OCR result for a key built with make_key."""
+        return self._lru.get(key)
+
+    def put(self, key: Tuple[str, str, str], text: str):
+        """Store an OCR result."""
+        self._lru.put(key, text)
+
+    def __len__(self) -> int:
+        return len(self._lru)
@@ -0,0 +1,65 @@
+"""Screen capture backends.
+
+Monitors grab the screen through a ``CaptureBackend`` so a faster
+platform-specific grabber can be swapped in without touching them.
+``ImageGrabBackend`` wraps Pillow's ``ImageGrab`` and works everywhere
+Pillow can capture the screen.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+BoundingBox = Tuple[int, int, int, int]
+
+
+class CaptureBackend:
+    """Base interface for screen capture backends."""
+
+    name = "base"
+
+    def grab(self, bbox: BoundingBox) -> np.ndarray:
+        """Capture a screen rectangle.
+
+        The returned array may be a view into a buffer reused by the next
+        grab; copy it (e.g. with ``Image.fromarray``) to keep it longer.
+
+        Args:
+            bbox: Tuple of (x1, y1, x2, y2) screen coordinates
+
+        Returns:
+            HxWx3 RGB array
+        """
+        raise NotImplementedError
+
+    def grab_clipboard(self) -> Optional[Image.Image]:
+        """Return the image currently on the clipboard, if any."""
+        from PIL import ImageGrab
+        img = ImageGrab.grabclipboard()
+        return img if isinstance(img, Image.Image) else None
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class ImageGrabBackend(CaptureBackend):
+    """Portable backend built on PIL.ImageGrab."""
+
+    name = "imagegrab"
+
+    def grab(self, bbox: BoundingBox) -> np.ndarray:
+        from PIL import ImageGrab
+        image = ImageGrab.grab(bbox=bbox)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return np.asarray(image)
+
+
+def create_backend() -> CaptureBackend:
+    """Create the screen capture backend for this platform.
+
+    Returns:
+        An ImageGrab backend, the only one available so far
+    """
+    return ImageGrabBackend()
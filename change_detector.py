@@ -0,0 +1,179 @@
+"""Fast frame change detection for the monitors.
+
+Frames are reduced to a small grid of cell brightness sums and compared
+against the previous frame with NumPy, so a static full-HD frame costs a
+few milliseconds. The change threshold rises with the noise level measured
+across the whole frame, so sources with sensor or compression noise do not
+trigger a full OCR pass on every tick.
+"""
+
+import numpy as np
+from PIL import Image
+from typing import Optional, Tuple, Union
+
+Frame = Union[Image.Image, np.ndarray]
+BoundingBox = Tuple[int, int, int, int]
+
+
+def to_gray_array(frame: Frame) -> np.ndarray:
+    """Convert a frame to a 2D grayscale array without copying when possible.
+
+    Args:
+        frame: PIL Image or NumPy array (HxW, HxWx3 or HxWx4)
+
+    Returns:
+        2D array of luminance values
+    """
+    if isinstance(frame, Image.Image):
+        if frame.mode != 'L':
+            frame = frame.convert('L')
+        return np.asarray(frame)
+
+    if frame.ndim == 2:
+        return frame
+    # Integer approximation of ITU-R 601 luma on the first three channels
+    rgb = frame[..., :3].astype(np.uint16)
+    return ((rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8).astype(np.uint8)
+
+
+class ChangeDetector:
+    """Detect meaningful changes between successive frames.
+
+    Args:
+        pixel_threshold: Minimum change in a cell's mean brightness (0-255,
+                         averaged over its colour channels) for the cell
+                         to count as changed
+        min_area: Minimum number of changed cells required to report a change.
+                  Values below 1 are treated as a fraction of all cells.
+        downsample: Cell size in pixels; each cell covers a
+                    downsample x downsample block of the original frame
+        noise_factor: A cell must also change by this many times the median
+                      cell change of the frame. Noise moves every cell a
+                      little, a text edit only a few cells, so the median
+                      measures the noise. 0 disables the adaptation.
+
+    The defaults were tuned on 14 px UI text at every alignment to the cell
+    grid. On clean sources the median is zero and pixel_threshold alone
+    applies: changing a single glyph ("Level 3" -> "Level 8", "HP 10" ->
+    "HP 16"), including grey-on-grey text, is always reported, while a
+    single changed pixel is not. On noisy sources the threshold scales with
+    the noise, which keeps frames that differ only by noise quiet but means
+    a change must stand out from the noise to be seen: with independent
+    +/-16 level noise on every frame, small grey-on-grey edits can be
+    missed while high-contrast text edits are still reported.
+    """
+
+    def __init__(self, pixel_threshold: int = 6, min_area: float = 2,
+                 downsample: int = 4, noise_factor: float = 8.0):
+        if downsample < 1:
+            raise ValueError("downsample must be at least 1")
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self.downsample = downsample
+        self.noise_factor = noise_factor
+        self.last_frame = None
+        self.last_shape = None
+        self.dirty_box = None
+
+    def reset(self):
+        """Forget the previous frame so the next one is reported as changed."""
+        self.last_frame = None
+        self.last_shape = None
+        self.dirty_box = None
+
+    def _reduce(self, frame: Frame) -> np.ndarray:
+        """Shrink a frame to one brightness sum per cell.
+
+        Every pixel counts, so a thin change such as a cursor or a single
+        glyph stroke is seen wherever it falls in the cell grid. PIL images
+        and arrays go through the same reduction. Colour channels are summed
+        unweighted, so channel order (RGB or BGR) does not matter. Frames
+        are read with strided slice additions rather than a full-size
+        grayscale copy.
+        """
+        if isinstance(frame, Image.Image):
+            if frame.mode not in ('L', 'RGB', 'RGBA'):
+                frame = frame.convert('RGB')
+            frame = np.asarray(frame)
+        step = self.downsample
+        channels = 1 if frame.ndim == 2 else 3
+        dtype = np.uint16 if channels * 255 * step * step <= 0xFFFF else np.uint32
+
+        # Sum each band of `step` rows, then each run of `step` columns.
+        # Edge cells smaller than a full cell just sum fewer pixels.
+        rows = None
+        for dy in range(step):
+            for c in range(channels):
+                band = frame[dy::step] if channels == 1 else frame[dy::step, :, c]
+                if rows is None:
+                    rows = band.astype(dtype)
+                else:
+                    rows[:band.shape[0]] += band
+        cells = rows[:, 0::step].copy()
+        for dx in range(1, step):
+            part = rows[:, dx::step]
+            cells[:, :part.shape[1]] += part
+        # Grayscale sums are scaled to match three summed colour channels
+        return cells.astype(np.int32) * (3 // channels)
+
+    def _cell_threshold(self) -> int:
+        """pixel_threshold scaled to the brightness sums of one cell."""
+        return self.pixel_threshold * 3 * self.downsample * self.downsample
+
+    def _threshold(self, diff: np.ndarray) -> float:
+        """Cell threshold for a frame, raised on noisy sources.
+
+        The median is taken over every other row and column of cells, which
+        is plenty to measure noise that covers the whole frame.
+        """
+        threshold = self._cell_threshold()
+        if self.noise_factor > 0:
+            noise = float(np.median(diff[::2, ::2]))
+            threshold = max(threshold, self.noise_factor * noise)
+        return threshold
+
+    def _min_cells(self, total_cells: int) -> int:
+        """Resolve min_area into an absolute number of cells."""
+        if self.min_area < 1:
+            return max(int(total_cells * self.min_area), 1)
+        return int(self.min_area)
+
+    def detect(self, frame: Frame) -> Optional[BoundingBox]:
+        """Compare a frame with the previous one.
+
+        Args:
+            frame: PIL Image or NumPy array to check
+
+        Returns:
+            Dirty bounding box (x1, y1, x2, y2) in frame pixel coordinates if
+            the frame changed enough, otherwise None
+        """
+        if isinstance(frame, Image.Image):
+            width, height = frame.size
+        else:
+            height, width = frame.shape[:2]
+        reduced = self._reduce(frame)
+
+        if self.last_frame is None or self.last_shape != (height, width):
+            self.last_frame = reduced
+            self.last_shape = (height, width)
+            self.dirty_box = (0, 0, width, height)
+            return self.dirty_box
+
+        diff = np.abs(reduced - self.last_frame)
+        changed = diff > self._threshold(diff)
+        if np.count_nonzero(changed) < self._min_cells(changed.size):
+            self.dirty_box = None
+            return None
+
+        self.last_frame = reduced
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        step = self.downsample
+        self.dirty_box = (
+            int(cols[0] * step),
+            int(rows[0] * step),
+            min(int((cols[-1] + 1) * step), width),
+            min(int((rows[-1] + 1) * step), height),
+        )
+        return self.dirty_box
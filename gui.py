@@ -1,13 +1,31 @@
 """Main GUI module for OCR Translator application."""
 
+import logging
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, scrolledtext
-from PIL import ImageGrab, Image
-from typing import Optional, Tuple
+from tkinter import ttk, scrolledtext, filedialog
+from PIL import Image
+from typing import Dict, List, Optional, Tuple
 
 from region_selector import RegionSelector
 from ocr_processor import OCRProcessor
-from monitor import ClipboardMonitor, RegionMonitor
+from cache import TranslationCache
+from preprocess import Preprocessor
+from paths import app_path
+from monitor import ClipboardMonitor, MonitoredRegion, RegionMonitor
+from pipeline import FrameJob, ProcessingPipeline
+from metrics import metrics
+from tuning import AutoTuner, ProfileStore, region_key
+from history import HistoryEntry, HistoryStore
+
+logger = logging.getLogger(__name__)
+
+# Languages offered as translation targets
+TARGET_LANGUAGES = ['en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko', 'zh-cn', 'zh-tw', 'ar']
+
+# Entries shown per page of the history window
+HISTORY_PAGE_SIZE = 50
 
 
 class OCRTranslatorApp:
@@ -24,16 +42,46 @@ class OCRTranslatorApp:
         self.root.geometry("900x700")
         
         self.monitor_mode = tk.StringVar(value="clipboard")
-        self.region = None
+        self.regions: Dict[str, Tuple[int, int, int, int]] = {}
         self.source_lang = tk.StringVar(value="auto")
         self.target_lang = tk.StringVar(value="en")
-        self.scan_interval = tk.DoubleVar(value=1.0)
+        self.extra_targets = {lang: tk.BooleanVar(value=False) for lang in TARGET_LANGUAGES}
+        self.min_interval = tk.DoubleVar(value=0.5)
+        self.max_interval = tk.DoubleVar(value=5.0)
         
+        self.ocr_processor = OCRProcessor(
+            translation_cache=TranslationCache(app_path('translations.db')),
+            preprocessor=Preprocessor()
+        )
+        self.pipeline = ProcessingPipeline(
+            self.ocr_processor,
+            on_ocr=lambda job, text: self.root.after(0, self._show_ocr_result, job, text),
+            on_translation=lambda job, translation, lang, target: self.root.after(
+                0, self._show_translation, job, translation, lang, target),
+            on_error=lambda job, stage, e, target: self.root.after(
+                0, self._show_error, job, stage, e, target),
+            on_skip=lambda job: self.root.after(0, self._show_unchanged, job),
+        )
         self.clipboard_monitor = ClipboardMonitor(self.process_image)
-        self.region_monitor = RegionMonitor(self.process_image)
-        self.ocr_processor = OCRProcessor()
+        self.region_monitor = RegionMonitor(self.process_region_image,
+                                            busy=self.pipeline.is_busy)
+        self.latest_jobs: Dict[str, FrameJob] = {}
+        # Per source: extracted text and its translation per target language
+        self.results: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self.profiles = ProfileStore()
+        self.tuner = AutoTuner(self.ocr_processor)
+        self.tuned_regions = set()
+        self.history = HistoryStore(app_path('history.db'))
+        
+        self.source_lang.trace_add('write', self._on_language_change)
+        self.target_lang.trace_add('write', self._on_language_change)
+        for var in self.extra_targets.values():
+            var.trace_add('write', self._on_language_change)
         
         self.setup_ui()
+        self._on_language_change()
+        self.pipeline.start()
+        self._start_warm_up()
         
     def setup_ui(self):
         """Set up the user interface."""
@@ -62,9 +110,17 @@ class OCRTranslatorApp:
         ttk.Radiobutton(mode_frame, text="Screen Region", variable=self.monitor_mode, 
                        value="region", command=self.on_mode_change).pack(side=tk.LEFT, padx=10)
         
-        self.region_btn = ttk.Button(mode_frame, text="Select Region", 
+        self.region_btn = ttk.Button(mode_frame, text="Add Region", 
                                     command=self.select_region, state='disabled')
-        self.region_btn.pack(side=tk.LEFT, padx=20)
+        self.region_btn.pack(side=tk.LEFT, padx=(20, 5))
+        
+        self.clear_regions_btn = ttk.Button(mode_frame, text="Clear Regions", 
+                                           command=self.clear_regions, state='disabled')
+        self.clear_regions_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.retune_btn = ttk.Button(mode_frame, text="Retune OCR", 
+                                    command=self.retune_regions, state='disabled')
+        self.retune_btn.pack(side=tk.LEFT, padx=(0, 20))
         
         self.region_label = ttk.Label(mode_frame, text="No region selected")
         self.region_label.pack(side=tk.LEFT, padx=10)
@@ -88,21 +144,83 @@ class OCRTranslatorApp:
         ttk.Label(control_frame, text="To:").pack(side=tk.LEFT, padx=(0, 5))
         target_combo = ttk.Combobox(control_frame, textvariable=self.target_lang, 
                                    width=15, state="readonly")
-        target_combo['values'] = ['en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 
-                                 'ja', 'ko', 'zh-cn', 'zh-tw', 'ar']
+        target_combo['values'] = TARGET_LANGUAGES
         target_combo.pack(side=tk.LEFT)
         
+        self.also_btn = ttk.Menubutton(control_frame, text="Also: none", width=14)
+        also_menu = tk.Menu(self.also_btn, tearoff=False)
+        for lang, var in self.extra_targets.items():
+            also_menu.add_checkbutton(label=lang, variable=var)
+        self.also_btn['menu'] = also_menu
+        self.also_btn.pack(side=tk.LEFT, padx=(5, 0))
+        
         ttk.Label(control_frame, text="Scan interval:").pack(side=tk.LEFT, padx=(20, 5))
-        interval_spin = ttk.Spinbox(control_frame, from_=0.5, to=10.0, increment=0.5,
-                                   textvariable=self.scan_interval, width=8)
-        interval_spin.pack(side=tk.LEFT)
+        min_spin = ttk.Spinbox(control_frame, from_=0.1, to=10.0, increment=0.1,
+                              textvariable=self.min_interval, width=5)
+        min_spin.pack(side=tk.LEFT)
+        ttk.Label(control_frame, text="to").pack(side=tk.LEFT, padx=5)
+        max_spin = ttk.Spinbox(control_frame, from_=0.5, to=60.0, increment=0.5,
+                              textvariable=self.max_interval, width=5)
+        max_spin.pack(side=tk.LEFT)
         ttk.Label(control_frame, text="seconds").pack(side=tk.LEFT, padx=(5, 0))
         
+        self.rate_label = ttk.Label(control_frame, text="")
+        self.rate_label.pack(side=tk.LEFT, padx=(10, 0))
+        
     def _create_status_label(self, parent):
-        """Create status display label."""
-        self.status_label = ttk.Label(parent, text="Status: Not monitoring", 
+        """Create status display label and engine readiness indicator."""
+        status_frame = ttk.Frame(parent)
+        status_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        self.status_label = ttk.Label(status_frame, text="Status: Not monitoring", 
                                      foreground="red")
-        self.status_label.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        self.status_label.pack(side=tk.LEFT)
+        
+        self.ready_label = ttk.Label(status_frame, text="OCR: starting...  Translator: connecting...",
+                                    foreground="gray")
+        self.ready_label.pack(side=tk.RIGHT)
+        self.readiness = {'OCR': "starting...", 'Translator': "connecting..."}
+    
+    def _start_warm_up(self):
+        """Start the OCR engine and translator connection in the background.
+        
+        The window is usable immediately; frames submitted before warm-up
+        finishes simply wait for the engine.
+        """
+        def warm_up():
+            try:
+                engine = self.ocr_processor.warm_up()
+                self.root.after(0, self._set_readiness, 'OCR', f"ready ({engine})")
+            except Exception:
+                logger.exception("Tesseract is not installed or not in PATH. Install it from "
+                                 "https://github.com/UB-Mannheim/tesseract/wiki (Windows), "
+                                 "with 'brew install tesseract' (Mac) or "
+                                 "'sudo apt-get install tesseract-ocr' (Linux)")
+                self.root.after(0, self._set_readiness, 'OCR', "Tesseract not found", True)
+            try:
+                self.ocr_processor.translation_client.connect()
+                self.root.after(0, self._set_readiness, 'Translator', "ready")
+            except Exception:
+                logger.exception("Error connecting to the translation service")
+                self.root.after(0, self._set_readiness, 'Translator', "offline", True)
+        
+        threading.Thread(target=warm_up, daemon=True).start()
+    
+    def _set_readiness(self, component: str, state: str, failed: bool = False):
+        """Update the readiness indicator for one component.
+        
+        Args:
+            component: 'OCR' or 'Translator'
+            state: Short description of the component's state
+            failed: Whether the component could not be started
+        """
+        self.readiness[component] = state
+        self.ready_label.config(
+            text="  ".join(f"{name}: {value}" for name, value in self.readiness.items()))
+        if failed:
+            self.ready_label.config(foreground="red")
+        elif all(value.startswith("ready") for value in self.readiness.values()):
+            self.ready_label.config(foreground="green")
         
     def _create_text_areas(self, parent):
         """Create text areas for extracted and translated text."""
@@ -120,34 +238,83 @@ class OCRTranslatorApp:
         
     def _create_process_button(self, parent):
         """Create manual process button."""
-        self.process_btn = ttk.Button(parent, text="Process Current Clipboard", 
+        button_frame = ttk.Frame(parent)
+        button_frame.grid(row=7, column=0, pady=(10, 0))
+        
+        self.process_btn = ttk.Button(button_frame, text="Process Current Clipboard", 
                                      command=self.process_clipboard_once)
-        self.process_btn.grid(row=7, column=0, pady=(10, 0))
+        self.process_btn.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(button_frame, text="Performance Stats", 
+                  command=self.open_stats_window).pack(side=tk.LEFT, padx=5)
+        self.stats_window = None
+        
+        ttk.Button(button_frame, text="History", 
+                  command=self.open_history_window).pack(side=tk.LEFT, padx=5)
+        self.history_window = None
         
     def on_mode_change(self):
         """Handle monitor mode change."""
         mode = self.monitor_mode.get()
         if mode == "region":
             self.region_btn.config(state='normal')
+            self.clear_regions_btn.config(state='normal')
+            self.retune_btn.config(state='normal')
             self.process_btn.config(state='disabled')
         else:
             self.region_btn.config(state='disabled')
+            self.clear_regions_btn.config(state='disabled')
+            self.retune_btn.config(state='disabled')
             self.process_btn.config(state='normal')
-            self.region = None
+            self.clear_regions()
+            
+    def _update_region_label(self):
+        """Describe the selected regions in the region label."""
+        if not self.regions:
             self.region_label.config(text="No region selected")
+        elif len(self.regions) == 1:
+            x1, y1, x2, y2 = next(iter(self.regions.values()))
+            self.region_label.config(text=f"Region: {x2-x1}x{y2-y1} at ({x1},{y1})")
+        else:
+            self.region_label.config(text=f"{len(self.regions)} regions selected")
+    
+    def clear_regions(self):
+        """Remove all selected regions."""
+        for name in self.regions:
+            self.pipeline.reset(name)
+            self.results.pop(name, None)
+            self.latest_jobs.pop(name, None)
+        self.regions.clear()
+        self.region_monitor.clear_regions()
+        self.tuned_regions.clear()
+        self._update_region_label()
             
+    def retune_regions(self):
+        """Drop the saved OCR profiles of the selected regions.
+        
+        Each region is calibrated again on its next changed frame.
+        """
+        for name, bbox in self.regions.items():
+            self.profiles.remove(region_key(bbox))
+            self.pipeline.set_profile(name, None)
+            self.tuned_regions.discard(name)
+        self.status_label.config(text="Status: OCR settings will be recalibrated", 
+                               foreground="blue")
+    
     def select_region(self):
-        """Open region selector interface."""
+        """Open region selector interface and add the selected region."""
         self.root.withdraw()
         
         def on_region_selected(region: Optional[Tuple[int, int, int, int]]):
             self.root.deiconify()
             if region:
-                self.region = region
-                x1, y1, x2, y2 = region
-                self.region_label.config(
-                    text=f"Region: {x2-x1}x{y2-y1} at ({x1},{y1})"
-                )
+                name = f"Region {len(self.regions) + 1}"
+                while name in self.regions:
+                    name += "'"
+                self.regions[name] = region
+                if self.region_monitor.monitoring:
+                    self.region_monitor.add_region(name, region)
+                self._update_region_label()
             
         selector = RegionSelector(on_region_selected)
         selector.run()
@@ -155,7 +322,7 @@ class OCRTranslatorApp:
     def toggle_monitoring(self):
         """Toggle monitoring on/off."""
         if self.monitor_btn['text'] == "Start Monitoring":
-            if self.monitor_mode.get() == "region" and not self.region:
+            if self.monitor_mode.get() == "region" and not self.regions:
                 self.status_label.config(text="Status: Please select a region first", 
                                        foreground="orange")
                 return
@@ -168,20 +335,169 @@ class OCRTranslatorApp:
             if self.monitor_mode.get() == "clipboard":
                 self.clipboard_monitor.start()
             else:
-                self.region_monitor.set_region(self.region)
-                self.region_monitor.set_interval(self.scan_interval.get())
+                self.region_monitor.clear_regions()
+                for name, region in self.regions.items():
+                    self.region_monitor.add_region(name, region)
+                self.region_monitor.set_interval_bounds(self.min_interval.get(),
+                                                        self.max_interval.get())
                 self.region_monitor.start()
+                self._update_scan_rate()
         else:
             self.monitor_btn.config(text="Start Monitoring")
             self.status_label.config(text="Status: Not monitoring", foreground="red")
             self.clipboard_monitor.stop()
             self.region_monitor.stop()
     
+    def open_stats_window(self):
+        """Open a live view of per-stage latency statistics."""
+        if self.stats_window is not None and self.stats_window.winfo_exists():
+            self.stats_window.lift()
+            return
+        
+        self.stats_window = tk.Toplevel(self.root)
+        self.stats_window.title("Kiana - Performance Stats")
+        self.stats_text = tk.Text(self.stats_window, width=72, height=24, 
+                                 font=('TkFixedFont', 9))
+        self.stats_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        ttk.Button(self.stats_window, text="Export JSON...", 
+                  command=self.export_stats).pack(pady=(0, 10))
+        self._refresh_stats()
+    
+    def _stats_extra(self) -> dict:
+        """Collect cache, queue and scheduler figures to show alongside latencies."""
+        return {
+            'caches': self.ocr_processor.cache_stats(),
+            'dropped_frames': self.pipeline.dropped_frames,
+            'scan_rates': self.region_monitor.rates(),
+        }
+    
+    def _refresh_stats(self):
+        """Redraw the stats window once per second while it is open."""
+        if self.stats_window is None or not self.stats_window.winfo_exists():
+            self.stats_window = None
+            return
+        extra = self._stats_extra()
+        caches = extra['caches']
+        lines = [
+            "Latency per stage (ms, rolling window)",
+            "",
+            metrics.format_table(),
+            "",
+            f"OCR cache hit rate:         {caches['ocr']['hit_rate']:.0%}",
+            f"Translation cache hit rate: {caches['translation']['memory']['hit_rate']:.0%}",
+            f"Dropped frames:             {extra['dropped_frames']}",
+        ]
+        for name, rate in extra['scan_rates'].items():
+            lines.append(f"Scan rate {name}: {rate:.2f}/s")
+        self._set_text(self.stats_text, "\n".join(lines))
+        self.root.after(1000, self._refresh_stats)
+    
+    def export_stats(self):
+        """Save the current statistics to a JSON file chosen by the user."""
+        path = filedialog.asksaveasfilename(parent=self.stats_window, defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            metrics.export_json(path, self._stats_extra())
+    
+    def open_history_window(self):
+        """Open a searchable, paged view of past results."""
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.lift()
+            return
+        
+        self.history_window = tk.Toplevel(self.root)
+        self.history_window.title("Kiana - History")
+        self.history_window.columnconfigure(0, weight=1)
+        self.history_window.rowconfigure(1, weight=1)
+        self.history_page = 0
+        self.history_entries: List[HistoryEntry] = []
+        
+        search_frame = ttk.Frame(self.history_window)
+        search_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=10, pady=(10, 5))
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
+        self.history_query = tk.StringVar()
+        self.history_query.trace_add('write', lambda *args: self._refresh_history(0))
+        ttk.Entry(search_frame, textvariable=self.history_query).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        
+        self.history_list = tk.Listbox(self.history_window, height=15, width=80, 
+                                       activestyle='none')
+        self.history_list.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=10)
+        self.history_list.bind('<<ListboxSelect>>', self._show_history_entry)
+        
+        nav_frame = ttk.Frame(self.history_window)
+        nav_frame.grid(row=2, column=0, pady=5)
+        ttk.Button(nav_frame, text="< Newer", 
+                  command=lambda: self._refresh_history(self.history_page - 1)).pack(side=tk.LEFT)
+        self.history_page_label = ttk.Label(nav_frame, text="")
+        self.history_page_label.pack(side=tk.LEFT, padx=10)
+        ttk.Button(nav_frame, text="Older >", 
+                  command=lambda: self._refresh_history(self.history_page + 1)).pack(side=tk.LEFT)
+        
+        self.history_raw = tk.Text(self.history_window, height=6, wrap=tk.WORD)
+        self.history_raw.grid(row=3, column=0, sticky=(tk.W, tk.E), padx=10, pady=(0, 5))
+        self.history_translation = tk.Text(self.history_window, height=6, wrap=tk.WORD)
+        self.history_translation.grid(row=4, column=0, sticky=(tk.W, tk.E), padx=10, pady=(0, 10))
+        self._refresh_history(0)
+    
+    def _refresh_history(self, page: Optional[int] = None):
+        """Load one page of history, or of search matches, into the list.
+        
+        Only the rows of the visible page are fetched, so the view stays
+        fast however long the history grows.
+        
+        Args:
+            page: Page to show, or None to reload the current one
+        """
+        if page is not None:
+            self.history_page = max(page, 0)
+        query = self.history_query.get()
+        offset = self.history_page * HISTORY_PAGE_SIZE
+        if query.strip():
+            # One extra match tells whether an older page exists
+            entries = self.history.search(query, HISTORY_PAGE_SIZE + 1, offset)
+            total = "many" if len(entries) > HISTORY_PAGE_SIZE else str(offset + len(entries))
+            entries = entries[:HISTORY_PAGE_SIZE]
+        else:
+            entries = self.history.page(offset, HISTORY_PAGE_SIZE)
+            total = str(self.history.count())
+        if not entries and self.history_page > 0:
+            self._refresh_history(self.history_page - 1)
+            return
+        
+        self.history_entries = entries
+        self.history_list.delete(0, tk.END)
+        for entry in entries:
+            stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry.created))
+            first_line = entry.text.strip().split("\n", 1)[0] if entry.text.strip() else ""
+            self.history_list.insert(tk.END, f"{stamp}  [{entry.source}]  {first_line}")
+        first = offset + 1 if entries else 0
+        self.history_page_label.config(text=f"{first}-{offset + len(entries)} of {total}")
+    
+    def _show_history_entry(self, event=None):
+        """Show the full text of the selected history entry."""
+        selection = self.history_list.curselection()
+        if not selection:
+            return
+        entry = self.history_entries[selection[0]]
+        self._set_text(self.history_raw, entry.text)
+        self._set_text(self.history_translation, entry.translation)
+    
+    def _update_scan_rate(self):
+        """Show the current effective scan rate while monitoring regions."""
+        if not self.region_monitor.monitoring:
+            self.rate_label.config(text="")
+            return
+        rates = self.region_monitor.rates()
+        if rates:
+            self.rate_label.config(text=f"(now {max(rates.values()):.1f} scans/s)")
+        self.root.after(1000, self._update_scan_rate)
+    
     def process_clipboard_once(self):
         """Process current clipboard content once."""
         try:
-            img = ImageGrab.grabclipboard()
-            if isinstance(img, Image.Image):
+            img = self.clipboard_monitor.backend.grab_clipboard()
+            if img is not None:
                 self.process_image(img)
             else:
                 self.status_label.config(text="Status: No image found in clipboard", 
@@ -190,53 +506,230 @@ class OCRTranslatorApp:
             self.status_label.config(text=f"Status: Error - {str(e)}", 
                                    foreground="red")
     
+    def _set_text(self, widget: tk.Text, text: str):
+        """Update the contents of a text area in place.
+        
+        Only the span between the common prefix and suffix of the old and
+        new text is replaced, so a changed line in a long result does not
+        re-layout the whole widget and the scroll position is kept.
+        
+        Args:
+            widget: Text area to update
+            text: New contents
+        """
+        old = widget.get(1.0, 'end-1c')
+        if old == text:
+            return
+        limit = min(len(old), len(text))
+        prefix = 0
+        while prefix < limit and old[prefix] == text[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == text[-1 - suffix]:
+            suffix += 1
+        widget.delete(f"1.0+{prefix}c", f"1.0+{len(old) - suffix}c")
+        widget.insert(f"1.0+{prefix}c", text[prefix:len(text) - suffix])
+    
+    def _target_langs(self) -> List[str]:
+        """Return the selected target language followed by any extra ones."""
+        primary = self.target_lang.get()
+        return [primary] + [lang for lang, var in self.extra_targets.items()
+                            if var.get() and lang != primary]
+    
+    def _on_language_change(self, *args):
+        """Pass the selected languages on to the processing pipeline."""
+        targets = self._target_langs()
+        self.pipeline.set_languages(self.source_lang.get(), targets)
+        self.also_btn.config(text=f"Also: {', '.join(targets[1:]) or 'none'}")
+    
     def process_image(self, img: Image.Image):
-        """Process image for OCR and translation.
+        """Queue image for OCR and translation.
+        
+        Safe to call from monitor threads; the work runs on the pipeline's
+        worker threads and only the widget updates come back to Tk.
         
         Args:
             img: PIL Image to process
         """
-        def update_ui():
+        self.pipeline.submit(img)
+        self.root.after(0, lambda: self.status_label.config(
+            text="Status: Processing image...", foreground="blue"))
+    
+    def process_region_image(self, img: Image.Image, region: MonitoredRegion):
+        """Queue a changed region for OCR and translation.
+        
+        Args:
+            img: PIL Image of the region
+            region: Region the image was captured from
+        """
+        self.pipeline.submit(img, region.name, region.source_lang, region.target_lang)
+        self.root.after(0, lambda: self.status_label.config(
+            text=f"Status: Processing {region.name}...", foreground="blue"))
+        if region.name not in self.tuned_regions:
+            self.tuned_regions.add(region.name)
+            self._load_profile(img, region)
+    
+    def _load_profile(self, img: Image.Image, region: MonitoredRegion):
+        """Apply the saved OCR profile of a region, calibrating one if needed.
+        
+        Calibration runs a dozen or so OCR passes, so it happens on its own
+        thread while frames keep being processed with the default settings.
+        
+        Args:
+            img: First frame captured from the region
+            region: Region to tune
+        """
+        key = region_key(region.bbox)
+        profile = self.profiles.get(key)
+        # Profiles saved before low-confidence ones were refused are retuned
+        if profile is not None and profile.confidence >= self.tuner.min_confidence:
+            self.pipeline.set_profile(region.name, profile)
+            return
+        
+        source_lang = region.source_lang or self.source_lang.get()
+        
+        def calibrate():
             try:
-                self.status_label.config(text="Status: Processing image...", 
-                                       foreground="blue")
-                
-                text = self.ocr_processor.extract_text(img)
-                
-                self.raw_text.delete(1.0, tk.END)
-                self.raw_text.insert(1.0, text)
-                
-                if text.strip():
-                    try:
-                        translation, detected_lang = self.ocr_processor.translate_text(
-                            text, 
-                            self.source_lang.get(), 
-                            self.target_lang.get()
-                        )
-                        
-                        self.translated_text.delete(1.0, tk.END)
-                        self.translated_text.insert(1.0, translation)
-                        
-                        mode_text = "clipboard" if self.monitor_mode.get() == "clipboard" else "region"
-                        self.status_label.config(
-                            text=f"Status: Processed successfully from {mode_text}", 
-                            foreground="green"
-                        )
-                    except Exception as e:
-                        self.translated_text.delete(1.0, tk.END)
-                        self.translated_text.insert(1.0, f"Translation error: {str(e)}")
-                        self.status_label.config(text="Status: Translation failed", 
-                                               foreground="orange")
-                else:
-                    self.translated_text.delete(1.0, tk.END)
-                    self.translated_text.insert(1.0, "No text detected in image")
-                    self.status_label.config(text="Status: No text found", 
-                                           foreground="orange")
-                    
-            except Exception as e:
-                self.status_label.config(text=f"Status: Error - {str(e)}", 
-                                       foreground="red")
-                self.translated_text.delete(1.0, tk.END)
-                self.translated_text.insert(1.0, f"Error: {str(e)}")
-        
-        self.root.after(0, update_ui)
\ No newline at end of file
+                tuned = self.tuner.calibrate(img, self.ocr_processor.ocr_language(source_lang))
+                if tuned is not None:
+                    self.profiles.put(key, tuned)
+            except Exception:
+                logger.exception("Error tuning OCR for %s", region.name)
+                tuned = None
+            if tuned is None:
+                # Try again on the region's next changed frame
+                self.tuned_regions.discard(region.name)
+                return
+            if region.name in self.tuned_regions:
+                self.pipeline.set_profile(region.name, tuned)
+        
+        threading.Thread(target=calibrate, daemon=True).start()
+    
+    def _render_results(self):
+        """Show the latest results of every source in the text areas.
+        
+        A single source is shown as plain text; several sources are shown as
+        one section per source. Translations into several languages are
+        shown as one section per language.
+        """
+        translations = {key: self._format_translations(result[1])
+                        for key, result in self.results.items()}
+        if len(self.results) == 1:
+            raw = next(iter(self.results.values()))[0]
+            translation = next(iter(translations.values()))
+        else:
+            raw = "\n\n".join(f"[{key}]\n{result[0]}" for key, result in self.results.items())
+            translation = "\n\n".join(f"[{key}]\n{text}" for key, text in translations.items())
+        self._set_text(self.raw_text, raw)
+        self._set_text(self.translated_text, translation)
+    
+    @staticmethod
+    def _format_translations(translations: Dict[str, str]) -> str:
+        """Join a source's translations, labelled by language if there are several."""
+        if len(translations) == 1:
+            return next(iter(translations.values()))
+        return "\n\n".join(f"({lang})\n{text}" for lang, text in translations.items())
+    
+    def _set_result(self, key: str, raw: Optional[str] = None,
+                    translation: Optional[str] = None, target_lang: Optional[str] = None,
+                    target_langs: Optional[Tuple[str, ...]] = None):
+        """Update the stored result of a source and redraw the text areas.
+        
+        Args:
+            key: Source of the result
+            raw: New extracted text, or None to keep the current one
+            translation: New translation, or None to keep the current one
+            target_lang: Language of translation, or None to show it for
+                         every target language
+            target_langs: Target languages to show, in order, or None to
+                          keep the current ones
+        """
+        raw_text, translations = self.results.get(key, ("", {}))
+        if target_langs is not None:
+            translations = {lang: translations.get(lang, "") for lang in target_langs}
+        if raw is not None:
+            raw_text = raw
+        if translation is not None:
+            for lang in ([target_lang] if target_lang else list(translations) or [""]):
+                translations[lang] = translation
+        self.results[key] = (raw_text, translations)
+        self._render_results()
+    
+    def _show_ocr_result(self, job, text: str):
+        """Display extracted text for a processed frame.
+        
+        Args:
+            job: Pipeline job the text belongs to
+            text: Extracted text
+        """
+        start = time.perf_counter()
+        self.latest_jobs[job.key] = job
+        
+        if not text.strip():
+            self._set_result(job.key, text, "No text detected in image",
+                             target_langs=job.target_langs)
+            self.status_label.config(text="Status: No text found", 
+                                   foreground="orange")
+        else:
+            self._set_result(job.key, raw=text, target_langs=job.target_langs)
+        metrics.record('ui_update', time.perf_counter() - start)
+    
+    def _show_translation(self, job, translation: str, detected_lang: str, target_lang: str):
+        """Display a translation of the most recently extracted text.
+        
+        Args:
+            job: Pipeline job the translation belongs to
+            translation: Translated text
+            detected_lang: Detected source language
+            target_lang: Language translated into
+        """
+        if job is not self.latest_jobs.get(job.key):
+            return
+        
+        start = time.perf_counter()
+        self._set_result(job.key, translation=translation, target_lang=target_lang)
+        metrics.record('ui_update', time.perf_counter() - start)
+        metrics.record('end_to_end', time.perf_counter() - job.submitted_at)
+        self.history.add(job.key, job.text, translation, job.source_lang, target_lang,
+                         detected_lang)
+        if (self.history_window is not None and self.history_window.winfo_exists()
+                and self.history_page == 0 and not self.history_query.get().strip()):
+            self._refresh_history()
+        
+        mode_text = "clipboard" if self.monitor_mode.get() == "clipboard" else "region"
+        detected_text = f" (detected: {detected_lang})" if detected_lang not in ("", "auto") else ""
+        self.status_label.config(
+            text=f"Status: Processed successfully from {mode_text}{detected_text}", 
+            foreground="green"
+        )
+    
+    def _show_unchanged(self, job):
+        """Report a frame whose text matched what is already shown.
+        
+        Args:
+            job: Pipeline job that was dropped as OCR jitter
+        """
+        self.status_label.config(text="Status: Text unchanged", foreground="green")
+    
+    def _show_error(self, job, stage: str, error: Exception, target_lang: Optional[str] = None):
+        """Display an error raised by a pipeline stage.
+        
+        Args:
+            job: Pipeline job that failed
+            stage: Name of the failing stage ('ocr' or 'translate')
+            error: Exception raised by the stage
+            target_lang: Language whose translation failed, for the
+                         'translate' stage
+        """
+        if stage == "translate":
+            if job is not self.latest_jobs.get(job.key):
+                return
+            self._set_result(job.key, translation=f"Translation error: {str(error)}",
+                             target_lang=target_lang)
+            self.status_label.config(text="Status: Translation failed", 
+                                   foreground="orange")
+        else:
+            self.status_label.config(text=f"Status: Error - {str(error)}", 
+                                   foreground="red")
+            self._set_result(job.key, translation=f"Error: {str(error)}",
+                             target_langs=job.target_langs)
@@ -0,0 +1,350 @@
+"""History of past OCR and translation results.
+
+Recent results are kept in a bounded in-memory ring buffer so the newest
+pages are served without touching the disk. Every result is also written,
+on a background thread, to SQLite with an FTS5 full-text index over both the
+extracted text and the translation, so older results can be paged through
+and searched quickly.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import List, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    """One OCR result and its translation."""
+
+    id: int
+    created: float
+    source: str
+    text: str
+    translation: str
+    source_lang: str
+    target_lang: str
+    detected_lang: str
+
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "id, created, source, text, translation, source_lang, target_lang, detected_lang"
+
+# Markers queued to the writer thread alongside new entries
+_CLEAR = object()
+_CLOSE = object()
+
+
+def fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching all words as prefixes.
+
+    Each word is quoted so punctuation in OCR text cannot break the query
+    syntax.
+    """
+    words = query.split()
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+class HistoryStore:
+    """Bounded history with a ring buffer in front of an indexed SQLite table.
+
+    add() only touches memory; rows are written to SQLite by a background
+    thread that commits whatever has queued up at once, so recording a
+    result never waits on the disk. Reads go through a second connection
+    and never wait for the writer either: entries still queued are served
+    from the ring and only rows already written are read from disk.
+
+    Entries get their id from SQLite once written; until then their id is 0.
+
+    Args:
+        path: SQLite database file, or None to keep history in memory only
+        memory_entries: Newest entries kept in the ring buffer
+        disk_entries: Maximum entries kept on disk; the oldest are dropped
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_entries: int = 200,
+                 disk_entries: int = 50000):
+        self.ring: deque = deque(maxlen=memory_entries)
+        self.disk_entries = disk_entries
+        self._db = None
+        self._reader = None
+        self._fts = False
+        self._next_id = 1
+        self._count = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        if path:
+            self._open(path)
+
+    def _open(self, path: str):
+        """Create the tables, load the newest entries and start the writer."""
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # Lets the reader connection query while the writer commits
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            " id INTEGER PRIMARY KEY, created REAL NOT NULL, source TEXT NOT NULL,"
+            " text TEXT NOT NULL, translation TEXT NOT NULL, source_lang TEXT NOT NULL,"
+            " target_lang TEXT NOT NULL, detected_lang TEXT NOT NULL)"
+        )
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+                " text, translation, content='history', content_rowid='id')"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN"
+                " INSERT INTO history_fts (rowid, text, translation)"
+                " VALUES (new.id, new.text, new.translation); END"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN"
+                " INSERT INTO history_fts (history_fts, rowid, text, translation)"
+                " VALUES ('delete', old.id, old.text, old.translation); END"
+            )
+            self._fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5; search falls back to LIKE scans
+            self._fts = False
+        self._db.commit()
+
+        rows = self._db.execute(
+            f"SELECT {_COLUMNS} FROM history ORDER BY id DESC LIMIT ?", (self.ring.maxlen,)
+        ).fetchall()
+        self.ring.extend(HistoryEntry(*row) for row in reversed(rows))
+        self._count = self._db.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def add(self, source: str, text: str, translation: str, source_lang: str,
+            target_lang: str, detected_lang: str = "") -> Optional[HistoryEntry]:
+        """Record a result.
+
+        A result identical to the previous one from the same source and
+        target language is not recorded again. The entry is written to
+        disk in the background.
+
+        Args:
+            source: Where the text came from, e.g. 'clipboard' or a region name
+            text: Extracted text
+            translation: Translated text
+            source_lang: Source language code
+            target_lang: Target language code
+            detected_lang: Detected source language
+
+        Returns:
+            The new entry, or None if it repeated the previous one
+        """
+        now = time.time()
+        with self._lock:
+            for previous in reversed(self.ring):
+                if previous.source == source and previous.target_lang == target_lang:
+                    if (previous.text, previous.translation) == (text, translation):
+                        return None
+                    break
+
+            if self._db is not None:
+                entry_id = 0
+            else:
+                entry_id = self._next_id
+                self._next_id += 1
+            entry = HistoryEntry(entry_id, now, source, text, translation,
+                                 source_lang, target_lang, detected_lang)
+            self._count += 1
+            self.ring.append(entry)
+            if self._db is not None:
+                self._queue.put(entry)
+            return entry
+
+    def _write_loop(self):
+        """Write queued entries, committing once per burst."""
+        while True:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(items)
+            except sqlite3.Error:
+                logger.exception("Writing history failed")
+                self._db.rollback()
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if _CLOSE in items:
+                return
+
+    def _write(self, items: list):
+        """Apply queued entries and clears to the database and commit.
+
+        Written entries are swapped in the ring for copies carrying the id
+        SQLite assigned.
+        """
+        written = []
+        for item in items:
+            if item is _CLOSE:
+                break
+            if item is _CLEAR:
+                self._db.execute("DELETE FROM history")
+                written.clear()
+                continue
+            cursor = self._db.execute(
+                "INSERT INTO history (created, source, text, translation, source_lang,"
+                " target_lang, detected_lang) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (item.created, item.source, item.text, item.translation,
+                 item.source_lang, item.target_lang, item.detected_lang)
+            )
+            written.append((item, cursor.lastrowid))
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune()
+        self._db.commit()
+
+        with self._lock:
+            for item, entry_id in written:
+                for i in range(len(self.ring) - 1, -1, -1):
+                    if self.ring[i] is item:
+                        self.ring[i] = replace(item, id=entry_id)
+                        break
+
+    def _prune(self):
+        """Trim the disk table to its size limit."""
+        newest = self._db.execute("SELECT MAX(id) FROM history").fetchone()[0] or 0
+        deleted = self._db.execute("DELETE FROM history WHERE id <= ?",
+                                   (newest - self.disk_entries,)).rowcount
+        with self._lock:
+            self._count -= max(deleted, 0)
+
+    def flush(self):
+        """Wait until every recorded entry is written to disk."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def _snapshot(self) -> Tuple[List[HistoryEntry], List[HistoryEntry]]:
+        """Return the ring newest first and its entries not yet written."""
+        with self._lock:
+            newest_first = list(reversed(self.ring))
+        return newest_first, [entry for entry in newest_first if not entry.id]
+
+    def _written_ids(self, pending: Set[HistoryEntry]) -> Set[int]:
+        """Return the ids given to entries of pending written since the snapshot."""
+        with self._lock:
+            return {entry.id for entry in self.ring
+                    if entry.id and replace(entry, id=0) in pending}
+
+    def _merged(self, unwritten: List[HistoryEntry], offset: int, limit: int,
+                condition: str, params: list) -> List[HistoryEntry]:
+        """Page through unwritten entries first, then through rows on disk.
+
+        Rows of entries the writer stored while the query ran would appear
+        twice, so they are excluded, querying again if more were stored.
+        """
+        entries = unwritten[offset:offset + limit]
+        pending = set(unwritten)
+        written = self._written_ids(pending)
+        while True:
+            exclude = f" AND id NOT IN ({', '.join('?' * len(written))})" if written else ""
+            rows = self._read(
+                f"SELECT {_COLUMNS} FROM history WHERE {condition}{exclude}"
+                " ORDER BY id DESC LIMIT ? OFFSET ?",
+                params + sorted(written) + [limit - len(entries),
+                                            max(offset - len(unwritten), 0)]
+            )
+            latest = self._written_ids(pending)
+            if latest == written:
+                return entries + rows
+            written = latest
+
+    def _read(self, sql: str, params: list) -> List[HistoryEntry]:
+        """Run a query on the reader connection."""
+        with self._read_lock:
+            if self._reader is None:
+                return []
+            rows = self._reader.execute(sql, params).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def count(self) -> int:
+        """Return the number of stored entries."""
+        with self._lock:
+            return self._count
+
+    def page(self, offset: int, limit: int) -> List[HistoryEntry]:
+        """Return a page of entries, newest first.
+
+        Pages within the ring buffer are served from memory.
+
+        Args:
+            offset: Number of newer entries to skip
+            limit: Maximum entries to return
+        """
+        newest_first, unwritten = self._snapshot()
+        if offset + limit <= len(newest_first) or self._db is None:
+            return newest_first[offset:offset + limit]
+        return self._merged(unwritten, offset, limit, "1", [])
+
+    def search(self, query: str, limit: int = 100, offset: int = 0) -> List[HistoryEntry]:
+        """Find entries whose text or translation contains all words of query.
+
+        Args:
+            query: Words to look for; each matches as a prefix
+            limit: Maximum entries to return
+            offset: Number of newer matches to skip
+
+        Returns:
+            Matching entries, newest first
+        """
+        words = query.split()
+        if not words:
+            return self.page(offset, limit)
+        newest_first, unwritten = self._snapshot()
+
+        def matches(entries):
+            return [entry for entry in entries
+                    if all(word.lower() in (entry.text + " " + entry.translation).lower()
+                           for word in words)]
+
+        if self._db is None:
+            return matches(newest_first)[offset:offset + limit]
+        if self._fts:
+            return self._merged(matches(unwritten), offset, limit,
+                                "id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)",
+                                [fts_query(query)])
+        conditions = " AND ".join(["(text || ' ' || translation) LIKE ?"] * len(words))
+        return self._merged(matches(unwritten), offset, limit, conditions,
+                            [f"%{word}%" for word in words])
+
+    def clear(self):
+        """Delete all history, waiting until it is gone from disk."""
+        with self._lock:
+            self.ring.clear()
+            self._count = 0
+            if self._db is not None:
+                self._queue.put(_CLEAR)
+        self.flush()
+
+    def close(self):
+        """Write any queued entries and close the database."""
+        if self._writer is not None:
+            self._queue.put(_CLOSE)
+            self._writer.join()
+            self._writer = None
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,152 @@
+"""Incremental translation of OCR text.
+
+OCR output is split into segments (paragraphs or lines) and compared with
+the previous result. Segments that were already translated are reused and
+only new or changed segments are sent for translation, so a dialog box that
+gains one line costs one short request instead of retranslating everything.
+"""
+
+import re
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+_PARAGRAPH_BREAK = re.compile(r'(\n[ \t]*\n\s*)')
+_LINE_BREAK = re.compile(r'(\n\s*)')
+
+
+def split_segments(text: str, mode: str = 'paragraph') -> Tuple[List[str], List[str]]:
+    """Split text into segments, keeping the separators for stitching.
+
+    Args:
+        text: Text to split
+        mode: 'paragraph' to split on blank lines, 'line' to split on newlines
+
+    Returns:
+        Tuple of (segments, separators) where separators[i] follows segments[i]
+    """
+    if mode == 'paragraph':
+        pattern = _PARAGRAPH_BREAK
+    elif mode == 'line':
+        pattern = _LINE_BREAK
+    else:
+        raise ValueError(f"Unknown segment mode: {mode}")
+
+    parts = pattern.split(text.strip())
+    return parts[0::2], parts[1::2] + ['']
+
+
+def join_segments(segments: List[str], separators: List[str]) -> str:
+    """Stitch segments back together with their original separators."""
+    return ''.join(segment + separator for segment, separator in zip(segments, separators))
+
+
+class IncrementalTranslator:
+    """Translates only the segments that changed since the previous text.
+
+    Args:
+        translate: Function taking (text, source_lang, target_lang) and
+                   returning (translated_text, detected_language)
+        mode: Segment granularity, 'paragraph' or 'line'
+        translate_batch: Optional function taking (texts, source_lang,
+                         target_lang) and returning a list of
+                         (translated_text, detected_language). When given,
+                         all changed segments are sent in one call.
+    """
+
+    def __init__(self, translate: Callable[[str, str, str], Tuple[str, str]],
+                 mode: str = 'paragraph',
+                 translate_batch: Optional[
+                     Callable[[List[str], str, str], List[Tuple[str, str]]]] = None):
+        self.translate = translate
+        self.translate_batch = translate_batch
+        self.mode = mode
+        self.translated_chars = 0
+        self.reused_segments = 0
+        self._previous: Dict[Tuple[Hashable, str, str], Dict[str, Tuple[str, str]]] = {}
+
+    def translate_segments(self, segments: List[str], source_lang: str,
+                           target_lang: str) -> List[Tuple[str, str]]:
+        """Translate a list of segments.
+
+        Args:
+            segments: Segments to translate
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            List of (translated_text, detected_language), one per segment
+        """
+        if self.translate_batch is not None:
+            return self.translate_batch(segments, source_lang, target_lang)
+        return [self.translate(segment, source_lang, target_lang) for segment in segments]
+
+    def translate_text(self, text: str, source_lang: str, target_lang: str,
+                       key: Hashable = None) -> Tuple[str, str]:
+        """Translate text, reusing translations of unchanged segments.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code ('auto' for auto-detect)
+            target_lang: Target language code
+            key: Source of the text; each source is diffed against its own
+                 previous text
+
+        Returns:
+            Tuple of (translated_text, detected_language)
+        """
+        if not text.strip():
+            return "", ""
+        segments, separators = split_segments(text, self.mode)
+        return self.translate_split(segments, separators, source_lang, target_lang, key)
+
+    def translate_split(self, segments: List[str], separators: List[str], source_lang: str,
+                        target_lang: str, key: Hashable = None) -> Tuple[str, str]:
+        """Translate text already split by split_segments.
+
+        Lets one split be shared when the same text is translated into
+        several target languages. Safe to call concurrently for different
+        target languages.
+
+        Args:
+            segments: Segments of the text
+            separators: Separators following each segment
+            source_lang: Source language code ('auto' for auto-detect)
+            target_lang: Target language code
+            key: Source of the text; each source is diffed against its own
+                 previous text
+
+        Returns:
+            Tuple of (translated_text, detected_language)
+        """
+        previous = self._previous.get((key, source_lang, target_lang), {})
+        known = {}
+        pending = []
+        for segment in segments:
+            if segment in previous:
+                known[segment] = previous[segment]
+                self.reused_segments += 1
+            elif segment not in known and segment not in pending:
+                pending.append(segment)
+
+        if pending:
+            results = self.translate_segments(pending, source_lang, target_lang)
+            known.update(zip(pending, results))
+            self.translated_chars += sum(len(segment) for segment in pending)
+
+        self._previous[(key, source_lang, target_lang)] = known
+        translated = [known[segment][0] for segment in segments]
+        detected_lang = next((known[segment][1] for segment in segments if known[segment][1]),
+                             source_lang)
+        return join_segments(translated, separators), detected_lang
+
+    def reset(self, key: Hashable = None):
+        """Forget the previous text of one source, or of all sources.
+
+        Args:
+            key: Source to forget, or None for all
+        """
+        if key is None:
+            self._previous.clear()
+            return
+        for previous_key in list(self._previous):
+            if previous_key[0] == key:
+                del self._previous[previous_key]
@@ -0,0 +1,184 @@
+"""Offline language identification.
+
+A small classifier good enough to decide whether text needs translating at
+all and which Tesseract language pack to read it with. Hangul and kana
+settle Korean and Japanese on their own. Han and Cyrillic text is only
+placed when it contains letters used by one language alone, since kanji-only
+Japanese reads like Chinese and Ukrainian or Bulgarian like Russian; Arabic
+script is shared by too many languages to be placed at all. Latin-script
+text is scored against compact profiles of each language's most frequent
+function words and distinctive letters. Text it cannot place confidently is
+reported as unknown and left to the translation service.
+"""
+
+import re
+from typing import Dict, FrozenSet, Optional
+
+# Most frequent function words per Latin-script language
+_STOPWORDS: Dict[str, FrozenSet[str]] = {
+    'en': frozenset("""the and of to in is it you that was for on are with as
+        his they be at this have from or had by but not what all were we when
+        your can there an which their if do will each how about up out them
+        then she many some so these would my me he i no yes""".split()),
+    'es': frozenset("""el la de que y en los se del las un por con no una su
+        para es al lo como más pero sus le ya o fue este ha sí porque esta son
+        entre cuando muy sin sobre también me hasta hay donde yo qué está""".split()),
+    'fr': frozenset("""le la les de des et un une du en est que qui dans pour
+        pas sur au avec ce il elle ne se plus par je nous vous mais ou sont
+        cette aux été très comme tout on y ça être avoir""".split()),
+    'de': frozenset("""der die das und in den von zu mit sich des auf für ist
+        im dem nicht ein eine als auch es an werden aus er hat dass sie nach
+        wird bei einer um am sind noch wie einem über einen so zum war ich""".split()),
+    'it': frozenset("""il di che e la per un in è non una sono mi si ho lo ma
+        ha le con ti ci del della questo se io cosa gli anche come da al nel
+        sei più bene molto perché tutto""".split()),
+    'pt': frozenset("""o a de que e do da em um para é com não uma os no se na
+        por mais as dos como mas foi ao ele das tem à seu sua ou ser quando
+        muito há nos já está eu também só pelo pela até isso você""".split()),
+}
+
+# Letters that only occur in one of the profiled languages
+_MARKERS: Dict[str, str] = {
+    'es': 'ñ¿¡',
+    'fr': 'œæ',
+    'de': 'ßäöü',
+    'pt': 'ãõ',
+}
+
+# Han characters written this way only in simplified or only in traditional
+# Chinese. Forms Japanese shares (国, 学, 時, 見, 間, ...) are left out, as
+# kanji-only Japanese text would otherwise pass for Chinese.
+_SIMPLIFIED = frozenset("这个们说时对为过还没么发经见门问间书车长东马开关吗话让给")
+_TRADITIONAL = frozenset("這們說來會國對還沒麼學發經關嗎話讓給")
+
+# Russian uses ы and э, and no letter outside the basic Cyrillic alphabet
+# such as Ukrainian і, Belarusian ў, Serbian ј or Kazakh ә
+_RUSSIAN_MARKERS = frozenset("ыэ")
+_RUSSIAN_LETTERS = frozenset("абвгдеёжзийклмнопрстуфхцчшщъыьэюя")
+
+# Translation language codes mapped to Tesseract language packs
+TESSERACT_LANGS: Dict[str, str] = {
+    'en': 'eng', 'es': 'spa', 'fr': 'fra', 'de': 'deu', 'it': 'ita', 'pt': 'por',
+    'ru': 'rus', 'ja': 'jpn', 'ko': 'kor', 'zh-cn': 'chi_sim', 'zh-tw': 'chi_tra',
+    'ar': 'ara',
+}
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+# Confidence needed before Latin-script text is placed. Function words of
+# one or two letters ('to', 'in', 'de') are shared by many languages,
+# including unprofiled ones such as Polish or Dutch, so they count for
+# little on their own.
+_SHORT_WORD_WEIGHT = 0.25
+_MIN_SCORE = 2.0
+_MIN_WORD_SHARE = 0.2
+
+
+def _script(ch: str) -> str:
+    """Name the writing system of a letter."""
+    code = ord(ch)
+    if code < 0x250:
+        return 'latin'
+    if 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return 'hangul'
+    if 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF or 0xFF66 <= code <= 0xFF9F:
+        return 'kana'
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF or 0xF900 <= code <= 0xFAFF:
+        return 'han'
+    if 0x0400 <= code <= 0x04FF:
+        return 'cyrillic'
+    if 0x0600 <= code <= 0x06FF or 0x0750 <= code <= 0x077F or 0xFB50 <= code <= 0xFEFF:
+        return 'arabic'
+    return 'other'
+
+
+def has_letters(text: str) -> bool:
+    """Return whether text contains anything worth translating.
+
+    Numbers, punctuation and symbols on their own read the same in every
+    language.
+    """
+    return any(ch.isalpha() for ch in text)
+
+
+def _classify_latin(text: str) -> Optional[str]:
+    """Pick the Latin-script language whose profile fits text best.
+
+    Returns None unless the best language scores at least _MIN_SCORE, its
+    function words make up at least _MIN_WORD_SHARE of the words and it
+    clearly beats the runner-up.
+    """
+    lowered = text.lower()
+    words = _WORD.findall(lowered)
+    if not words:
+        return None
+    scores = dict.fromkeys(_STOPWORDS, 0.0)
+    hits = dict.fromkeys(_STOPWORDS, 0)
+    for word in words:
+        for lang, stopwords in _STOPWORDS.items():
+            if word in stopwords:
+                scores[lang] += 1 if len(word) > 2 else _SHORT_WORD_WEIGHT
+                hits[lang] += 1
+    for lang, letters in _MARKERS.items():
+        scores[lang] += sum(lowered.count(letter) for letter in letters)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, top), (_, runner_up) = ranked[0], ranked[1]
+    if top < _MIN_SCORE or top < 2 * runner_up:
+        return None
+    if hits[best] < _MIN_WORD_SHARE * len(words):
+        return None
+    return best
+
+
+def _classify_cyrillic(text: str) -> Optional[str]:
+    """Return 'ru' if text uses letters marking it as Russian, else None."""
+    letters = {ch for ch in text.lower() if _script(ch) == 'cyrillic' and ch.isalpha()}
+    if letters & _RUSSIAN_MARKERS and letters <= _RUSSIAN_LETTERS:
+        return 'ru'
+    return None
+
+
+def detect_language(text: str) -> Optional[str]:
+    """Identify the language of a piece of text.
+
+    Args:
+        text: Text to classify
+
+    Returns:
+        Language code in the form used for translation (e.g. 'en', 'ja',
+        'zh-cn'), or None when the text has no letters or could not be
+        placed confidently
+    """
+    counts: Dict[str, int] = {}
+    for ch in text:
+        if ch.isalpha():
+            script = _script(ch)
+            counts[script] = counts.get(script, 0) + 1
+    if not counts:
+        return None
+
+    # Japanese mixes kana with Han; Chinese never uses kana
+    kana = counts.pop('kana', 0)
+    if kana:
+        counts['han'] = counts.get('han', 0) + kana
+    dominant = max(counts, key=counts.get)
+
+    if dominant == 'han' and kana:
+        return 'ja'
+    if dominant == 'latin':
+        return _classify_latin(text)
+    if dominant == 'han':
+        simplified = sum(ch in _SIMPLIFIED for ch in text)
+        traditional = sum(ch in _TRADITIONAL for ch in text)
+        if simplified == traditional:
+            return None
+        return 'zh-tw' if traditional > simplified else 'zh-cn'
+    if dominant == 'cyrillic':
+        return _classify_cyrillic(text)
+    return {'hangul': 'ko'}.get(dominant)
+
+
+def same_language(a: Optional[str], b: Optional[str]) -> bool:
+    """Return whether two language codes name the same language."""
+    return bool(a and b) and a.lower() == b.lower()
@@ -4,30 +4,32 @@ A desktop application that performs OCR on screenshots or screen regions
 and translates the extracted text in real-time.
 """
 
-import pytesseract
-import os
-import tkinter as tk
-from gui import OCRTranslatorApp
-
-if os.path.exists(r'C:\Program Files\Tesseract-OCR\tesseract.exe'):
-    pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+import logging
+import sys
 
 
 def main():
-    """Entry point for the OCR Translator application."""
-    try:
-        pytesseract.get_tesseract_version()
-    except:
-        print("Error: Tesseract is not installed or not in PATH")
-        print("Please install Tesseract OCR:")
-        print("- Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki")
-        print("- Mac: brew install tesseract")
-        print("- Linux: sudo apt-get install tesseract-ocr")
+    """Entry point for the OCR Translator application.
+    
+    Runs headless batch processing when started as ``main.py batch ...``,
+    otherwise opens the GUI. The window appears right away; Tesseract is
+    checked and warmed up in the background and reported in the window.
+    """
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        import batch
+        batch.main(sys.argv[2:])
         return
     
+    import tkinter as tk
+    from gui import OCRTranslatorApp
+    
     root = tk.Tk()
     app = OCRTranslatorApp(root)
     root.mainloop()
+    app.history.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+"""Per-stage latency instrumentation.
+
+Every stage of the capture-to-translation path records its duration into a
+rolling histogram, so the share of time spent in capture, change detection,
+OCR, translation and UI updates can be inspected live or exported as JSON.
+
+Usage:
+    from metrics import metrics
+
+    with metrics.timer('ocr'):
+        text = engine.recognize(image)
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class LatencyHistogram:
+    """Rolling window of latency samples with percentile summaries.
+
+    Args:
+        window: Number of most recent samples kept
+    """
+
+    def __init__(self, window: int = 1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ms: float):
+        """Add a sample in milliseconds."""
+        with self._lock:
+            self.samples.append(ms)
+            self.count += 1
+            self.total += ms
+
+    def summary(self) -> Dict[str, float]:
+        """Return count and p50/p95/p99/max of the current window in milliseconds."""
+        with self._lock:
+            ordered = sorted(self.samples)
+            count = self.count
+        if not ordered:
+            return {'count': count}
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(int(len(ordered) * p), len(ordered) - 1)], 3)
+
+        return {
+            'count': count,
+            'mean': round(sum(ordered) / len(ordered), 3),
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': round(ordered[-1], 3),
+        }
+
+
+class Metrics:
+    """Registry of stage latency histograms and event counters.
+
+    Args:
+        window: Samples kept per stage histogram
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.enabled = True
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def _histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram(self.window))
+        return histogram
+
+    def record(self, stage: str, seconds: float):
+        """Record a stage duration.
+
+        Args:
+            stage: Stage name, e.g. 'capture' or 'ocr'
+            seconds: Duration in seconds
+        """
+        if self.enabled:
+            self._histogram(stage).record(seconds * 1000)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block and record it under a stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def increment(self, name: str, amount: int = 1):
+        """Increase an event counter, e.g. dropped frames or errors."""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        """Return all stage summaries and counters as a JSON-serialisable dict."""
+        with self._lock:
+            stages = dict(self.histograms)
+            counters = dict(self.counters)
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'stages': {name: histogram.summary() for name, histogram in sorted(stages.items())},
+            'counters': counters,
+        }
+
+    def format_table(self) -> str:
+        """Return the stage summaries as a fixed-width text table."""
+        snapshot = self.snapshot()
+        lines = [f"{'stage':<20}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"]
+        for name, summary in snapshot['stages'].items():
+            if 'p50' not in summary:
+                continue
+            lines.append(f"{name:<20}{summary['count']:>8}{summary['p50']:>10.1f}"
+                         f"{summary['p95']:>10.1f}{summary['p99']:>10.1f}{summary['max']:>10.1f}")
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"{name:<20}{value:>8}")
+        return "\n".join(lines)
+
+    def export_json(self, path: str, extra: Optional[dict] = None):
+        """Write a snapshot to a JSON file.
+
+        Args:
+            path: Output file path
+            extra: Additional fields to include, such as cache statistics
+        """
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def reset(self):
+        """Drop all recorded samples and counters."""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+
+metrics = Metrics()
@@ -1,23 +1,37 @@
 """Monitoring modules for clipboard and screen regions."""
 
-import io
+import logging
 import time
 import threading
-from PIL import ImageGrab, Image
-from typing import Optional, Callable, Tuple
+from PIL import Image
+from typing import Dict, List, Optional, Callable, Tuple
+
+from capture import CaptureBackend, ImageGrabBackend, create_backend
+from change_detector import ChangeDetector
+from metrics import metrics
+from scheduler import AdaptiveScheduler
+
+logger = logging.getLogger(__name__)
 
 
 class ClipboardMonitor:
     """Monitor system clipboard for image changes."""
     
-    def __init__(self, callback: Callable[[Image.Image], None]):
+    def __init__(self, callback: Callable[[Image.Image], None],
+                 detector: Optional[ChangeDetector] = None,
+                 backend: Optional[CaptureBackend] = None):
         """Initialize clipboard monitor.
         
         Args:
             callback: Function to call when new image is detected
+            detector: Change detector used to compare clipboard images.
+                     Clipboard images are compared at full resolution by default.
+            backend: Capture backend used to read the clipboard
         """
         self.callback = callback
-        self.last_image = None
+        self.backend = backend or ImageGrabBackend()
+        self.detector = detector or ChangeDetector(pixel_threshold=0, min_area=1,
+                                                   downsample=1)
         self.monitoring = False
         self.thread = None
         
@@ -35,84 +49,236 @@ class ClipboardMonitor:
         """Main monitoring loop."""
         while self.monitoring:
             try:
-                img = ImageGrab.grabclipboard()
+                with metrics.timer('capture_clipboard'):
+                    img = self.backend.grab_clipboard()
                 
-                if isinstance(img, Image.Image):
-                    img_bytes = io.BytesIO()
-                    img.save(img_bytes, format='PNG')
-                    img_data = img_bytes.getvalue()
-                    
-                    if img_data != self.last_image:
-                        self.last_image = img_data
+                if img is not None:
+                    with metrics.timer('change_detect'):
+                        changed = self.detector.detect(img) is not None
+                    if changed:
+                        metrics.increment('frames_changed')
                         self.callback(img)
                         
-            except Exception as e:
-                print(f"Error monitoring clipboard: {e}")
+            except Exception:
+                metrics.increment('errors_capture')
+                logger.exception("Error monitoring clipboard")
                 
             time.sleep(0.5)
 
 
+class MonitoredRegion:
+    """A named screen region with its own scan settings.
+    
+    Args:
+        name: Unique region name
+        bbox: Tuple of (x1, y1, x2, y2) screen coordinates
+        scheduler: Adaptive scheduler deciding when the region is scanned
+        source_lang: Source language for this region, or None for the default
+        target_lang: Target language for this region, or None for the default
+        detector: Change detector for this region's frames
+        fixed_bounds: Whether the scheduler bounds were set for this region
+                      and should not follow the monitor defaults
+    """
+    
+    def __init__(self, name: str, bbox: Tuple[int, int, int, int],
+                 scheduler: AdaptiveScheduler, source_lang: Optional[str] = None,
+                 target_lang: Optional[str] = None,
+                 detector: Optional[ChangeDetector] = None, fixed_bounds: bool = False):
+        self.name = name
+        self.bbox = bbox
+        self.scheduler = scheduler
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.detector = detector or ChangeDetector()
+        self.fixed_bounds = fixed_bounds
+        self.next_scan = 0.0
+
+
+def union_bbox(boxes: List[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+    """Return the smallest box containing all given boxes."""
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
 class RegionMonitor:
-    """Monitor specific screen region for changes."""
+    """Monitor one or more named screen regions for changes.
+    
+    Each tick grabs the screen once, covering the union of all regions that
+    are due, and checks each region on a view into that single capture.
+    Regions are scanned on an adaptive schedule: quickly after a change,
+    backing off while static or while the previous frame is still busy.
+    """
     
-    def __init__(self, callback: Callable[[Image.Image], None]):
+    def __init__(self, callback: Callable[[Image.Image, MonitoredRegion], None],
+                 detector_factory: Callable[[], ChangeDetector] = ChangeDetector,
+                 busy: Optional[Callable[[str], bool]] = None,
+                 backend: Optional[CaptureBackend] = None):
         """Initialize region monitor.
         
         Args:
-            callback: Function to call when region content changes
+            callback: Function to call with (image, region) when a region's
+                     content changes
+            detector_factory: Creates the change detector for each region.
+                             Defaults to a downsampled diff that ignores
+                             isolated pixel noise.
+            busy: Function telling whether the frame last sent for a region
+                 name is still being processed
+            backend: Screen capture backend. Defaults to the one
+                    create_backend() picks for this platform.
         """
         self.callback = callback
-        self.region = None
-        self.last_image = None
+        self.backend = backend or create_backend()
+        self.detector_factory = detector_factory
+        self.busy = busy or (lambda name: False)
+        self.regions: Dict[str, MonitoredRegion] = {}
         self.monitoring = False
         self.thread = None
-        self.scan_interval = 1.0
+        self.min_interval = 0.5
+        self.max_interval = 5.0
+        self._lock = threading.Lock()
+        
+    def add_region(self, name: str, bbox: Tuple[int, int, int, int],
+                   min_interval: Optional[float] = None,
+                   max_interval: Optional[float] = None,
+                   source_lang: Optional[str] = None,
+                   target_lang: Optional[str] = None) -> MonitoredRegion:
+        """Add or replace a named region.
+        
+        Args:
+            name: Unique region name
+            bbox: Tuple of (x1, y1, x2, y2) coordinates
+            min_interval: Fastest scan interval for this region, or None for
+                         the monitor default
+            max_interval: Slowest scan interval for this region, or None for
+                         the monitor default
+            source_lang: Source language override for this region
+            target_lang: Target language override for this region
+            
+        Returns:
+            The monitored region
+        """
+        scheduler = AdaptiveScheduler(min_interval or self.min_interval,
+                                      max_interval or self.max_interval)
+        region = MonitoredRegion(name, bbox, scheduler, source_lang, target_lang,
+                                 self.detector_factory(),
+                                 fixed_bounds=bool(min_interval or max_interval))
+        with self._lock:
+            self.regions[name] = region
+        return region
+    
+    def remove_region(self, name: str):
+        """Stop monitoring a named region.
+        
+        Args:
+            name: Region name
+        """
+        with self._lock:
+            self.regions.pop(name, None)
+    
+    def clear_regions(self):
+        """Remove all regions."""
+        with self._lock:
+            self.regions.clear()
         
     def set_region(self, region: Tuple[int, int, int, int]):
-        """Set the region to monitor.
+        """Monitor a single region, replacing any existing regions.
         
         Args:
             region: Tuple of (x1, y1, x2, y2) coordinates
         """
-        self.region = region
+        self.clear_regions()
+        self.add_region("default", region)
         
     def set_interval(self, interval: float):
-        """Set scan interval in seconds.
+        """Scan at a fixed interval in seconds, disabling backoff.
         
         Args:
             interval: Time between scans in seconds
         """
-        self.scan_interval = interval
+        self.set_interval_bounds(interval, interval)
+    
+    def set_interval_bounds(self, min_interval: float, max_interval: float):
+        """Set the default adaptive scan interval bounds in seconds.
+        
+        Regions added with their own bounds keep them.
+        
+        Args:
+            min_interval: Interval used right after a change
+            max_interval: Longest interval reached on a static screen
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        with self._lock:
+            for region in self.regions.values():
+                if not region.fixed_bounds:
+                    region.scheduler.set_bounds(self.min_interval, self.max_interval)
+    
+    def rates(self) -> Dict[str, float]:
+        """Return the current effective scan rate of each region in scans per second."""
+        with self._lock:
+            return {name: region.scheduler.rate for name, region in self.regions.items()}
         
     def start(self):
-        """Start monitoring region in background thread."""
-        if not self.region:
+        """Start monitoring regions in background thread."""
+        if not self.regions:
             raise ValueError("Region not set")
             
         self.monitoring = True
+        with self._lock:
+            for region in self.regions.values():
+                region.detector.reset()
+                region.next_scan = 0.0
         self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.thread.start()
         
     def stop(self):
-        """Stop monitoring region."""
+        """Stop monitoring regions."""
         self.monitoring = False
+    
+    def _scan(self, due: List[MonitoredRegion]) -> List[MonitoredRegion]:
+        """Grab the union of the due regions once and check each region.
+        
+        The capture may live in a buffer reused by the next grab, so
+        changed regions are copied into images before being handed on.
+        
+        Returns:
+            The regions whose content changed
+        """
+        ux1, uy1, ux2, uy2 = union_bbox([region.bbox for region in due])
+        with metrics.timer('capture'):
+            frame = self.backend.grab((ux1, uy1, ux2, uy2))
+        
+        changed = []
+        for region in due:
+            x1, y1, x2, y2 = region.bbox
+            view = frame[y1 - uy1:y2 - uy1, x1 - ux1:x2 - ux1]
+            with metrics.timer('change_detect'):
+                dirty = region.detector.detect(view)
+            if dirty is not None:
+                changed.append(region)
+                metrics.increment('frames_changed')
+                self.callback(Image.fromarray(view), region)
+        return changed
         
     def _monitor_loop(self):
         """Main monitoring loop."""
         while self.monitoring:
-            try:
-                x1, y1, x2, y2 = self.region
-                img = ImageGrab.grab(bbox=(x1, y1, x2, y2))
-                
-                img_bytes = io.BytesIO()
-                img.save(img_bytes, format='PNG')
-                img_data = img_bytes.getvalue()
-                
-                if img_data != self.last_image:
-                    self.last_image = img_data
-                    self.callback(img)
-                    
-            except Exception as e:
-                print(f"Error monitoring region: {e}")
-                
-            time.sleep(self.scan_interval)
\ No newline at end of file
+            now = time.monotonic()
+            with self._lock:
+                regions = list(self.regions.values())
+            due = [region for region in regions if region.next_scan <= now]
+            
+            if due:
+                changed = []
+                try:
+                    changed = self._scan(due)
+                except Exception:
+                    metrics.increment('errors_capture')
+                    logger.exception("Error monitoring region")
+                for region in due:
+                    delay = region.scheduler.record(region in changed, self.busy(region.name))
+                    region.next_scan = now + delay
+            
+            next_scan = min((region.next_scan for region in regions),
+                            default=now + self.min_interval)
+            time.sleep(max(next_scan - time.monotonic(), 0.01))
@@ -0,0 +1,464 @@
+"""OCR engine backends.
+
+The pytesseract backend starts a new ``tesseract`` process and reloads the
+language data for every call. The pooled backends keep long-lived Tesseract
+API instances warm instead, so each call only pays for the recognition
+itself: through the optional ``tesserocr`` package when it is installed,
+otherwise by loading the ``libtesseract`` library that ships with every
+Tesseract install through ctypes. pytesseract remains the fallback when
+neither can be loaded.
+
+Packages and libraries are loaded on first use rather than with this
+module, so importing it costs nothing at application startup.
+"""
+
+import ctypes
+import ctypes.util
+import glob
+import logging
+import os
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from PIL import Image
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WINDOWS_TESSERACT = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+_UNSET = object()
+_tesserocr = _UNSET
+
+
+def _pytesseract():
+    """Import pytesseract, pointing it at the default Windows install if present."""
+    import pytesseract
+    if os.path.exists(WINDOWS_TESSERACT):
+        pytesseract.pytesseract.tesseract_cmd = WINDOWS_TESSERACT
+    return pytesseract
+
+
+def _load_tesserocr():
+    """Import the optional tesserocr package, returning None if it is missing."""
+    global _tesserocr
+    if _tesserocr is _UNSET:
+        try:
+            import tesserocr
+            _tesserocr = tesserocr
+        except ImportError:
+            _tesserocr = None
+    return _tesserocr
+
+
+def tesserocr_available() -> bool:
+    """Return whether the pooled tesserocr engine can be used."""
+    return _load_tesserocr() is not None
+
+
+def parse_config(config: str) -> Tuple[Optional[int], Optional[int]]:
+    """Extract page segmentation and engine modes from a Tesseract config string.
+
+    Args:
+        config: Config string such as '--psm 7 --oem 1'
+
+    Returns:
+        Tuple of (psm, oem), each None when not specified
+    """
+    psm = re.search(r'--psm\s+(\d+)', config)
+    oem = re.search(r'--oem\s+(\d+)', config)
+    return (int(psm.group(1)) if psm else None,
+            int(oem.group(1)) if oem else None)
+
+
+class OCREngine:
+    """Base interface for OCR backends."""
+
+    name = "base"
+    # Whether concurrent recognize() calls run in parallel without
+    # per-call start-up cost, which makes reading a frame in tiles pay off
+    parallel = False
+
+    def recognize(self, image: Image.Image, lang: str = 'eng', config: str = '') -> str:
+        """Extract text from an image.
+
+        Args:
+            image: PIL Image object to process
+            lang: Tesseract language code(s), e.g. 'eng' or 'eng+jpn'
+            config: Extra Tesseract options, e.g. '--psm 7'
+
+        Returns:
+            Extracted text string
+        """
+        raise NotImplementedError
+
+    def confidence(self, image: Image.Image, lang: str = 'eng', config: str = '') -> float:
+        """Recognise an image and return the mean word confidence.
+
+        Args:
+            image: PIL Image object to process
+            lang: Tesseract language code(s)
+            config: Extra Tesseract options
+
+        Returns:
+            Mean confidence of the recognised words from 0 to 100, or 0 when
+            nothing was recognised
+        """
+        raise NotImplementedError
+
+    def version(self) -> str:
+        """Return the Tesseract version, raising if Tesseract is not usable."""
+        raise NotImplementedError
+
+    def warm_up(self, lang: str = 'eng'):
+        """Load the language data for lang so the first real frame is not slowed down."""
+        self.recognize(Image.new('L', (32, 32), 255), lang)
+
+    def languages(self) -> FrozenSet[str]:
+        """Return the installed Tesseract language packs, e.g. {'eng', 'jpn'}."""
+        return frozenset()
+
+    def close(self):
+        """Release any resources held by the engine."""
+
+
+class PytesseractEngine(OCREngine):
+    """Runs a fresh tesseract process per call through pytesseract."""
+
+    name = "pytesseract"
+    _languages: Optional[FrozenSet[str]] = None
+
+    def recognize(self, image: Image.Image, lang: str = 'eng', config: str = '') -> str:
+        return _pytesseract().image_to_string(image, lang=lang, config=config)
+
+    def confidence(self, image: Image.Image, lang: str = 'eng', config: str = '') -> float:
+        pytesseract = _pytesseract()
+        data = pytesseract.image_to_data(image, lang=lang, config=config,
+                                         output_type=pytesseract.Output.DICT)
+        confs = [float(conf) for conf, word in zip(data['conf'], data['text'])
+                 if float(conf) >= 0 and word.strip()]
+        return sum(confs) / len(confs) if confs else 0.0
+
+    def languages(self) -> FrozenSet[str]:
+        # Listing the packs starts a tesseract process, so ask only once
+        if self._languages is None:
+            try:
+                self._languages = frozenset(_pytesseract().get_languages(config=''))
+            except Exception:
+                logger.exception("Error listing Tesseract languages")
+                self._languages = frozenset()
+        return self._languages
+
+    def version(self) -> str:
+        return str(_pytesseract().get_tesseract_version())
+
+    def warm_up(self, lang: str = 'eng'):
+        # Every call starts a fresh process, so there is nothing to keep warm
+        self.version()
+
+
+class _PooledEngine(OCREngine):
+    """Keeps a pool of initialised Tesseract API instances per language.
+
+    The APIs release the GIL while recognising, so calls from several
+    threads run in parallel, one per pooled instance. Subclasses create the
+    instances, which offer tesserocr's PyTessBaseAPI methods.
+
+    Args:
+        pool_size: Number of API instances kept per (language, engine mode)
+        warm_langs: Languages to initialise up front instead of on first use
+    """
+
+    parallel = True
+
+    def __init__(self, pool_size: int = 2, warm_langs: Tuple[str, ...] = ('eng',)):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self._pools: Dict[Tuple[str, Optional[int]], queue.Queue] = {}
+        self._apis: List = []
+        self._languages: Optional[FrozenSet[str]] = None
+        self._lock = threading.Lock()
+        for lang in warm_langs:
+            self._get_pool(lang, None)
+
+    def _create_api(self, lang: str, oem: Optional[int]):
+        """Create and initialise a single Tesseract API instance."""
+        raise NotImplementedError
+
+    def _page_seg_mode(self, psm: Optional[int]):
+        """Convert a page segmentation mode for the API; None means automatic."""
+        return 3 if psm is None else psm
+
+    def _get_pool(self, lang: str, oem: Optional[int]) -> queue.Queue:
+        """Return the pool for a language and engine mode, creating it if needed."""
+        key = (lang, oem)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = queue.Queue()
+                for _ in range(self.pool_size):
+                    api = self._create_api(lang, oem)
+                    self._apis.append(api)
+                    pool.put(api)
+                self._pools[key] = pool
+            return pool
+
+    @contextmanager
+    def _borrow(self, image: Image.Image, lang: str, config: str):
+        """Take a pooled API, load the image into it and return it afterwards."""
+        psm, oem = parse_config(config)
+        pool = self._get_pool(lang, oem)
+        api = pool.get()
+        try:
+            api.SetPageSegMode(self._page_seg_mode(psm))
+            api.SetImage(image)
+            yield api
+        finally:
+            api.Clear()
+            pool.put(api)
+
+    def recognize(self, image: Image.Image, lang: str = 'eng', config: str = '') -> str:
+        with self._borrow(image, lang, config) as api:
+            return api.GetUTF8Text()
+
+    def confidence(self, image: Image.Image, lang: str = 'eng', config: str = '') -> float:
+        with self._borrow(image, lang, config) as api:
+            api.Recognize()
+            return float(api.MeanTextConf())
+
+    def warm_up(self, lang: str = 'eng'):
+        self._get_pool(lang, None)
+
+    def close(self):
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis.clear()
+            self._pools.clear()
+
+
+class TesserocrPoolEngine(_PooledEngine):
+    """Pool of tesserocr API instances.
+
+    Args:
+        pool_size: Number of API instances kept per (language, engine mode)
+        warm_langs: Languages to initialise up front instead of on first use
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, pool_size: int = 2, warm_langs: Tuple[str, ...] = ('eng',)):
+        if _load_tesserocr() is None:
+            raise RuntimeError("tesserocr is not installed")
+        super().__init__(pool_size, warm_langs)
+
+    def _create_api(self, lang: str, oem: Optional[int]):
+        if oem is None:
+            return _tesserocr.PyTessBaseAPI(lang=lang)
+        return _tesserocr.PyTessBaseAPI(lang=lang, oem=_tesserocr.OEM(oem))
+
+    def _page_seg_mode(self, psm: Optional[int]):
+        return _tesserocr.PSM(psm) if psm is not None else _tesserocr.PSM.AUTO
+
+    def languages(self) -> FrozenSet[str]:
+        if self._languages is None:
+            self._languages = frozenset(_tesserocr.get_languages()[1])
+        return self._languages
+
+    def version(self) -> str:
+        return _tesserocr.tesseract_version()
+
+
+def find_libtesseract() -> Tuple[Optional[str], Optional[str]]:
+    """Locate the library and language data of the installed Tesseract.
+
+    The tesseract command reports where its language data lives. The
+    library is looked up next to the command (Windows installs) or in its
+    prefix's lib directory (Homebrew), then on the system library path.
+
+    Returns:
+        Tuple of (library, tessdata directory), each None if not found
+    """
+    command = shutil.which(_pytesseract().pytesseract.tesseract_cmd)
+    if command is None:
+        return ctypes.util.find_library('tesseract'), None
+    try:
+        listing = subprocess.run([command, '--list-langs'], capture_output=True,
+                                 text=True, timeout=10)
+        match = re.search(r'"(.+?)"', listing.stdout + listing.stderr)
+    except (OSError, subprocess.SubprocessError):
+        match = None
+    datapath = match.group(1) if match else None
+
+    folder = os.path.dirname(os.path.realpath(command))
+    candidates = sorted(glob.glob(os.path.join(folder, 'libtesseract*.dll'))
+                        + glob.glob(os.path.join(folder, '..', 'lib', 'libtesseract*.dylib')))
+    library = candidates[0] if candidates else ctypes.util.find_library('tesseract')
+    return library, datapath
+
+
+class _TessBaseAPI:
+    """Minimal ctypes wrapper of Tesseract's C API.
+
+    Offers the PyTessBaseAPI methods the pool uses. Every call goes through
+    ctypes, which releases the GIL for its duration.
+    """
+
+    def __init__(self, lib: ctypes.CDLL, datapath: Optional[str], lang: str,
+                 oem: Optional[int]):
+        self._lib = lib
+        self._handle = lib.TessBaseAPICreate()
+        path = datapath.encode() if datapath else None
+        if oem is None:
+            status = lib.TessBaseAPIInit3(self._handle, path, lang.encode())
+        else:
+            status = lib.TessBaseAPIInit2(self._handle, path, lang.encode(), oem)
+        if status != 0:
+            lib.TessBaseAPIDelete(self._handle)
+            raise RuntimeError(f"Tesseract could not load language '{lang}'")
+        # Per-page notes such as the estimated resolution would otherwise be
+        # printed for every frame; pytesseract discards them the same way
+        lib.TessBaseAPISetVariable(self._handle, b'debug_file', os.devnull.encode())
+
+    def SetPageSegMode(self, psm: int):
+        self._lib.TessBaseAPISetPageSegMode(self._handle, psm)
+
+    def SetImage(self, image: Image.Image):
+        if image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+        depth = 1 if image.mode == 'L' else 3
+        width, height = image.size
+        # Tesseract copies the pixels, so the buffer need not outlive the call
+        self._lib.TessBaseAPISetImage(self._handle, image.tobytes(), width, height,
+                                      depth, width * depth)
+
+    def Recognize(self) -> int:
+        return self._lib.TessBaseAPIRecognize(self._handle, None)
+
+    def GetUTF8Text(self) -> str:
+        text = self._lib.TessBaseAPIGetUTF8Text(self._handle)
+        if not text:
+            return ""
+        try:
+            return ctypes.string_at(text).decode('utf-8', errors='replace')
+        finally:
+            self._lib.TessDeleteText(text)
+
+    def MeanTextConf(self) -> int:
+        return self._lib.TessBaseAPIMeanTextConf(self._handle)
+
+    def Clear(self):
+        self._lib.TessBaseAPIClear(self._handle)
+
+    def End(self):
+        if self._handle:
+            self._lib.TessBaseAPIEnd(self._handle)
+            self._lib.TessBaseAPIDelete(self._handle)
+            self._handle = None
+
+
+def _load_libtesseract(path: str) -> ctypes.CDLL:
+    """Load libtesseract and declare the C API functions the engine calls."""
+    if sys.platform == 'win32':
+        # The DLLs it depends on sit next to it in the Tesseract folder
+        os.add_dll_directory(os.path.dirname(os.path.abspath(path)))
+    lib = ctypes.CDLL(path)
+    handle, text = ctypes.c_void_p, ctypes.c_char_p
+    signatures = {
+        'TessVersion': (text, []),
+        'TessBaseAPICreate': (handle, []),
+        'TessBaseAPIInit2': (ctypes.c_int, [handle, text, text, ctypes.c_int]),
+        'TessBaseAPIInit3': (ctypes.c_int, [handle, text, text]),
+        'TessBaseAPISetPageSegMode': (None, [handle, ctypes.c_int]),
+        'TessBaseAPISetImage': (None, [handle, ctypes.c_char_p, ctypes.c_int, ctypes.c_int,
+                                       ctypes.c_int, ctypes.c_int]),
+        'TessBaseAPISetVariable': (ctypes.c_int, [handle, text, text]),
+        'TessBaseAPIRecognize': (ctypes.c_int, [handle, ctypes.c_void_p]),
+        'TessBaseAPIGetUTF8Text': (ctypes.c_void_p, [handle]),
+        'TessDeleteText': (None, [ctypes.c_void_p]),
+        'TessBaseAPIMeanTextConf': (ctypes.c_int, [handle]),
+        'TessBaseAPIClear': (None, [handle]),
+        'TessBaseAPIEnd': (None, [handle]),
+        'TessBaseAPIDelete': (None, [handle]),
+    }
+    for name, (restype, argtypes) in signatures.items():
+        function = getattr(lib, name)
+        function.restype = restype
+        function.argtypes = argtypes
+    return lib
+
+
+class LibtesseractPoolEngine(_PooledEngine):
+    """Pool of Tesseract API instances driven through libtesseract's C API.
+
+    Needs no Python package beyond the standard library: it loads the
+    library installed alongside the tesseract command, so it is available
+    wherever pytesseract works.
+
+    Args:
+        pool_size: Number of API instances kept per (language, engine mode)
+        warm_langs: Languages to initialise up front instead of on first use
+        library: Path of libtesseract. Found next to the tesseract command
+                 when omitted.
+        datapath: Tesseract's tessdata directory. Asked from the tesseract
+                  command when omitted.
+    """
+
+    name = "libtesseract"
+
+    def __init__(self, pool_size: int = 2, warm_langs: Tuple[str, ...] = ('eng',),
+                 library: Optional[str] = None, datapath: Optional[str] = None):
+        if library is None or datapath is None:
+            found_library, found_datapath = find_libtesseract()
+            library = library or found_library
+            datapath = datapath or found_datapath
+        if library is None:
+            raise RuntimeError("libtesseract not found")
+        self.datapath = datapath
+        self._lib = _load_libtesseract(library)
+        super().__init__(pool_size, warm_langs)
+
+    def _create_api(self, lang: str, oem: Optional[int]):
+        return _TessBaseAPI(self._lib, self.datapath, lang, oem)
+
+    def languages(self) -> FrozenSet[str]:
+        if self._languages is None:
+            if self.datapath:
+                files = glob.glob(os.path.join(self.datapath, '*.traineddata'))
+                self._languages = frozenset(os.path.basename(f)[:-len('.traineddata')]
+                                            for f in files)
+            else:
+                self._languages = PytesseractEngine().languages()
+        return self._languages
+
+    def version(self) -> str:
+        return self._lib.TessVersion().decode()
+
+
+def create_engine(pool_size: int = 2, use_pool: bool = True) -> OCREngine:
+    """Create the fastest available OCR engine.
+
+    Args:
+        pool_size: Number of warm Tesseract instances per language
+        use_pool: Set to False to always use the pytesseract fallback
+
+    Returns:
+        A pooled tesserocr engine when tesserocr is installed, otherwise a
+        pool over the installed libtesseract, otherwise pytesseract
+    """
+    if use_pool and tesserocr_available():
+        try:
+            return TesserocrPoolEngine(pool_size=pool_size)
+        except Exception:
+            logger.exception("Error starting tesserocr pool, trying libtesseract")
+    if use_pool:
+        try:
+            return LibtesseractPoolEngine(pool_size=pool_size)
+        except Exception as e:
+            logger.warning("libtesseract pool unavailable (%s), using pytesseract", e)
+    return PytesseractEngine()
@@ -1,29 +1,278 @@
 """OCR and translation processing module."""
 
-import pytesseract
-from deep_translator import GoogleTranslator
+import copy
+import re
+import threading
 from PIL import Image
+from typing import Dict, List, Optional, Tuple, Union
+
+from cache import OCRCache, TranslationCache
+from language_id import TESSERACT_LANGS, detect_language, has_letters, same_language
+from metrics import metrics
+from ocr_engine import OCREngine, create_engine
+from preprocess import Preprocessor
+from tiling import TiledOCR
+from translation_client import TranslationClient
+from tuning import OCRProfile
 
 
 class OCRProcessor:
-    """Handles OCR extraction and text translation."""
+    """Handles OCR extraction and text translation.
+    
+    Args:
+        engine: OCR backend to use. Defaults to a warm pool of Tesseract
+               instances (tesserocr, or the installed libtesseract),
+               falling back to pytesseract; the default engine is created
+               on first use or by warm_up().
+        pool_size: Number of warm Tesseract instances when creating the engine
+        lang: Tesseract language code(s) used for extraction
+        config: Extra Tesseract options, e.g. '--psm 6'
+        translation_cache: Cache for translations. Defaults to an
+                          in-memory cache.
+        translation_client: HTTP client used for translation requests.
+                           Defaults to one created on first use, so a
+                           processor that only runs OCR starts no
+                           translation threads.
+        preprocessor: Image preprocessing applied before OCR, or None to
+                     send images to Tesseract unchanged
+        ocr_cache: Cache of OCR results keyed by pixel content. Defaults to
+                  a bounded in-memory cache.
+        tiler: Splits large frames into text blocks that are recognised in
+              parallel and cached separately. Defaults to one worker per
+              pooled engine instance when the engine runs calls in
+              parallel (the warm pools); with pytesseract every tile would start
+              its own tesseract process, so frames are read whole. Pass
+              False to always read frames whole.
+    """
+    
+    def __init__(self, engine: Optional[OCREngine] = None, pool_size: int = 2,
+                 lang: str = 'eng', config: str = '',
+                 translation_cache: Optional[TranslationCache] = None,
+                 translation_client: Optional[TranslationClient] = None,
+                 preprocessor: Optional[Preprocessor] = None,
+                 ocr_cache: Optional[OCRCache] = None,
+                 tiler: Optional[TiledOCR] = None):
+        self._engine = engine
+        self._engine_lock = threading.Lock()
+        self.pool_size = pool_size
+        self.lang = lang
+        self.config = config
+        self.translation_cache = translation_cache or TranslationCache()
+        self._translation_client = translation_client
+        self._client_lock = threading.Lock()
+        self.preprocessor = preprocessor
+        self.ocr_cache = ocr_cache or OCRCache()
+        self._tiler = tiler
+        self._scaled: Dict[Optional[float], Preprocessor] = {}
+    
+    @property
+    def engine(self) -> OCREngine:
+        """OCR backend, created on first use."""
+        if self._engine is not None:
+            return self._engine
+        with self._engine_lock:
+            if self._engine is None:
+                self._engine = create_engine(pool_size=self.pool_size)
+            return self._engine
+    
+    @property
+    def translation_client(self) -> TranslationClient:
+        """HTTP client for translation requests, created on first use."""
+        if self._translation_client is not None:
+            return self._translation_client
+        with self._client_lock:
+            if self._translation_client is None:
+                self._translation_client = TranslationClient()
+            return self._translation_client
+    
+    @property
+    def tiler(self) -> Union[TiledOCR, bool]:
+        """Tiler used for large frames, or False when frames are read whole."""
+        if self._tiler is None:
+            engine = self.engine
+            with self._engine_lock:
+                if self._tiler is None:
+                    self._tiler = TiledOCR(workers=self.pool_size) if engine.parallel else False
+        return self._tiler
+    
+    def warm_up(self) -> str:
+        """Prepare OCR ahead of the first frame.
+        
+        Creates the engine, checks that Tesseract runs and loads the default
+        language data. Takes from milliseconds to a few seconds, so callers
+        should run it off the UI thread.
+        
+        Returns:
+            Description of the engine, e.g. 'tesserocr 5.3.0'
+            
+        Raises:
+            Exception: If Tesseract is missing or fails to start
+        """
+        with metrics.timer('warm_up'):
+            engine = self.engine
+            version = engine.version()
+            engine.warm_up(self.lang)
+        return f"{engine.name} {version}"
+    
+    def _settings(self, lang: Optional[str],
+                  profile: Optional[OCRProfile]) -> Tuple[str, str, Optional[Preprocessor]]:
+        """Resolve the language, Tesseract options and preprocessing to use.
+        
+        An explicit language wins over the profile's, which wins over the
+        default. Profile modes replace the same options in the default config.
+        """
+        config = self.config
+        preprocessor = self.preprocessor
+        if profile is not None:
+            lang = lang or profile.lang
+            for option, value in (('psm', profile.psm), ('oem', profile.oem)):
+                if value is not None:
+                    config = re.sub(rf'--{option}\s+\d+', '', config)
+            config = f"{config} {profile.config}".strip()
+            if preprocessor is not None and profile.scale != preprocessor.scale:
+                preprocessor = self._scaled_preprocessor(profile.scale)
+        return lang or self.lang, config, preprocessor
+    
+    def _scaled_preprocessor(self, scale: Optional[float]) -> Preprocessor:
+        """Return a copy of the preprocessor with a fixed upscale factor."""
+        preprocessor = self._scaled.get(scale)
+        if preprocessor is None:
+            preprocessor = copy.copy(self.preprocessor)
+            preprocessor.scale = scale
+            self._scaled[scale] = preprocessor
+        return preprocessor
     
     @staticmethod
-    def extract_text(image: Image.Image) -> str:
+    def _settings_key(config: str, preprocessor: Optional[Preprocessor]) -> str:
+        """Describe everything besides the pixels and language that affects OCR output."""
+        if preprocessor is not None:
+            return config + preprocessor.settings_key()
+        return config
+    
+    def ocr_language(self, language: Optional[str]) -> Optional[str]:
+        """Choose the Tesseract language pack for a translation language.
+        
+        Args:
+            language: Language code such as 'ja', or None if unknown
+            
+        Returns:
+            The matching pack when it is installed, otherwise None
+        """
+        pack = TESSERACT_LANGS.get((language or '').lower())
+        if pack and pack in self.engine.languages():
+            return pack
+        return None
+    
+    def extract_text(self, image: Image.Image, lang: Optional[str] = None,
+                     profile: Optional[OCRProfile] = None) -> str:
         """Extract text from image using Tesseract OCR.
         
+        Frames that were already recognised with the same settings are
+        answered from the OCR cache without running Tesseract. Large frames
+        are split into text blocks so only blocks whose pixels changed are
+        read again, several at a time.
+        
         Args:
             image: PIL Image object to process
+            lang: Tesseract language pack(s) to use, or None for the default
+            profile: Tuned settings of the region the image came from
             
         Returns:
             Extracted text string
         """
-        return pytesseract.image_to_string(image)
+        settings = self._settings(lang, profile)
+        key = self.ocr_cache.make_key(image, settings[0], self._settings_key(*settings[1:]))
+        cached = self.ocr_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if self.tiler and self.tiler.applies_to(image):
+            with metrics.timer('layout'):
+                blocks = self.tiler.find_blocks(image)
+            text = self.tiler.extract_text(image, lambda tile: self._recognize(tile, *settings),
+                                           blocks)
+        else:
+            text = self._recognize(image, *settings, cached=False)
+        self.ocr_cache.put(key, text)
+        return text
+    
+    def _recognize(self, image: Image.Image, lang: str, config: str,
+                   preprocessor: Optional[Preprocessor], cached: bool = True) -> str:
+        """Preprocess and recognise one image or tile.
+        
+        Args:
+            image: Image to read
+            lang: Tesseract language pack(s) to use
+            config: Tesseract options
+            preprocessor: Preprocessing to apply, or None
+            cached: Whether to consult and fill the OCR cache
+        """
+        if cached:
+            key = self.ocr_cache.make_key(image, lang, self._settings_key(config, preprocessor))
+            hit = self.ocr_cache.get(key)
+            if hit is not None:
+                metrics.increment('tiles_reused')
+                return hit
+        
+        if preprocessor is not None:
+            with metrics.timer('preprocess'):
+                image = preprocessor.process(image)
+        with metrics.timer('ocr'):
+            text = self.engine.recognize(image, lang, config)
+        if cached:
+            self.ocr_cache.put(key, text)
+        return text
+    
+    def measure_confidence(self, image: Image.Image, profile: OCRProfile) -> float:
+        """Read an image with a candidate profile and return the mean word confidence.
+        
+        Used by calibration; bypasses the OCR cache so every call really runs.
+        
+        Args:
+            image: Sample frame
+            profile: Candidate settings
+        """
+        lang, config, preprocessor = self._settings(None, profile)
+        if preprocessor is not None:
+            image = preprocessor.process(image)
+        return self.engine.confidence(image, lang, config)
+    
+    def cache_stats(self) -> dict:
+        """Return hit/miss counters of the OCR and translation caches."""
+        return {
+            'ocr': self.ocr_cache.stats.as_dict(),
+            'translation': self.translation_cache.stats(),
+        }
     
     @staticmethod
-    def translate_text(text: str, source_lang: str, target_lang: str) -> tuple[str, str]:
+    def _detect(text: str, source_lang: str) -> Optional[str]:
+        """Return the language of text: the chosen one, or detected for 'auto'."""
+        if source_lang != 'auto':
+            return source_lang
+        return detect_language(text)
+    
+    @staticmethod
+    def _untranslated(text: str, detected_lang: Optional[str],
+                      target_lang: str) -> Optional[Tuple[str, str]]:
+        """Return the result for text that needs no translation, else None.
+        
+        Text without letters (numbers, punctuation, symbols) and text already
+        in the target language is passed through unchanged.
+        """
+        if not has_letters(text):
+            return text, ""
+        if same_language(detected_lang, target_lang):
+            return text, detected_lang
+        return None
+    
+    def translate_text(self, text: str, source_lang: str, target_lang: str) -> tuple[str, str]:
         """Translate text from source to target language.
         
+        Repeated text is answered from the translation cache without a
+        network request, as is text that is already in the target language
+        or has nothing to translate. With source_lang 'auto' the language is
+        identified offline and reported when it could be placed.
+        
         Args:
             text: Text to translate
             source_lang: Source language code ('auto' for auto-detect)
@@ -37,14 +286,66 @@ class OCRProcessor:
         """
         if not text.strip():
             return "", ""
+        
+        detected_lang = self._detect(text, source_lang)
+        untranslated = self._untranslated(text, detected_lang, target_lang)
+        if untranslated is not None:
+            metrics.increment('translations_skipped')
+            return untranslated
+        
+        cached = self.translation_cache.get(text, source_lang, target_lang)
+        if cached is not None:
+            return cached
+        
+        translation_text = self.translation_client.translate(text, source_lang, target_lang)
+        detected_lang = detected_lang or source_lang
+        
+        self.translation_cache.put(text, source_lang, target_lang,
+                                   translation_text, detected_lang)
+        return translation_text, detected_lang
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Tuple[str, str]]:
+        """Translate several texts, sending only cache misses over the network.
+        
+        Texts needing no translation are passed through as in translate_text;
+        misses are packed into as few concurrent requests as possible.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code ('auto' for auto-detect)
+            target_lang: Target language code
             
-        if source_lang == 'auto':
-            translator = GoogleTranslator(source='auto', target=target_lang)
-            translation_text = translator.translate(text)
-            detected_lang = 'auto'
-        else:
-            translator = GoogleTranslator(source=source_lang, target=target_lang)
-            translation_text = translator.translate(text)
-            detected_lang = source_lang
+        Returns:
+            List of (translated_text, detected_language), one per text
             
-        return translation_text, detected_lang
\ No newline at end of file
+        Raises:
+            Exception: If translation fails
+        """
+        results: List[Optional[Tuple[str, str]]] = []
+        detected: List[Optional[str]] = []
+        misses = []
+        for i, text in enumerate(texts):
+            detected.append(self._detect(text, source_lang))
+            if not text.strip():
+                result = ("", "")
+            else:
+                result = self._untranslated(text, detected[i], target_lang)
+                if result is not None:
+                    metrics.increment('translations_skipped')
+                else:
+                    result = self.translation_cache.get(text, source_lang, target_lang)
+            results.append(result)
+            if result is None:
+                misses.append(i)
+        
+        if misses:
+            translations = self.translation_client.translate_batch(
+                [texts[i] for i in misses], source_lang, target_lang
+            )
+            for i, translation_text in zip(misses, translations):
+                detected_lang = detected[i] or source_lang
+                results[i] = (translation_text, detected_lang)
+                self.translation_cache.put(texts[i], source_lang, target_lang,
+                                           translation_text, detected_lang)
+        return results
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""Locations of per-user application data."""
+
+import os
+
+APP_DIR = os.path.join(os.path.expanduser('~'), '.kiana')
+
+
+def app_path(name: str) -> str:
+    """Return the path of a file in the application data directory.
+
+    The directory is created if it does not exist yet.
+
+    Args:
+        name: File name inside the data directory
+
+    Returns:
+        Absolute path to the file
+    """
+    os.makedirs(APP_DIR, exist_ok=True)
+    return os.path.join(APP_DIR, name)
@@ -0,0 +1,396 @@
+"""Background processing pipeline for OCR and translation.
+
+Frames coming from the monitors are handed to a small chain of worker
+threads. Each stage holds at most one waiting item per source, so when
+frames arrive faster than they can be processed the stale ones are dropped
+and only the most recent frame of each clipboard or region is worked on.
+
+A frame can be translated into several target languages. Its text is
+OCRed and split into segments once, and the translations run concurrently,
+each reported as soon as it is ready.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from PIL import Image
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+from incremental import IncrementalTranslator, split_segments
+from language_id import detect_language
+from metrics import metrics
+from stability import TextStabilizer
+from tuning import OCRProfile
+
+
+class LatestQueue:
+    """Queue holding at most one waiting item per key.
+
+    A newer item replaces an item with the same key that is still waiting,
+    so each source (a clipboard or a screen region) only ever has its most
+    recent frame queued. Keys are served in the order they became pending.
+    """
+
+    def __init__(self):
+        self._items: Dict[Hashable, Any] = {}
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item: Any, key: Hashable = None) -> bool:
+        """Store an item, replacing any waiting item with the same key.
+
+        Args:
+            item: Item to store
+            key: Source the item belongs to
+
+        Returns:
+            True if a waiting item was replaced
+        """
+        with self._cond:
+            replaced = key in self._items
+            self._items[key] = item
+            self._cond.notify()
+            return replaced
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Take the oldest waiting item, blocking until one is available.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+
+        Returns:
+            The item, or None on timeout or when the queue is closed
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            if not self._items:
+                return None
+            key = next(iter(self._items))
+            return self._items.pop(key)
+
+    def pending(self, key: Hashable = None) -> bool:
+        """Return whether an item is waiting for the given key."""
+        with self._cond:
+            return key in self._items
+
+    def close(self):
+        """Wake up any waiting consumer and refuse further blocking."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+@dataclass
+class FrameJob:
+    """A captured frame travelling through the pipeline.
+
+    target_lang is the first of target_langs, the languages the frame's
+    text is translated into.
+    """
+
+    image: Image.Image
+    source_lang: str
+    target_lang: str
+    key: str = "clipboard"
+    submitted_at: float = field(default_factory=time.perf_counter)
+    text: str = ""
+    target_langs: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        if not self.target_langs:
+            self.target_langs = (self.target_lang,)
+
+
+def _target_tuple(target_langs: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+    """Normalize one or several target languages to a tuple without repeats."""
+    if isinstance(target_langs, str):
+        return (target_langs,)
+    return tuple(dict.fromkeys(target_langs))
+
+
+class ProcessingPipeline:
+    """Runs OCR and translation as separate stages on worker threads.
+
+    Callbacks are invoked from the worker threads; GUI code must marshal
+    them back onto its own event loop.
+
+    Args:
+        processor: OCRProcessor used for extraction and translation
+        on_ocr: Called with (job, text) once OCR finishes
+        on_translation: Called with (job, translation, detected_lang,
+                        target_lang) once per target language
+        on_error: Called with (job, stage, exception, target_lang) when a
+                  stage fails; target_lang is None for the OCR stage
+        segment_mode: Granularity used to retranslate only changed text,
+                      'paragraph' or 'line'
+        stabilizer: Filters OCR jitter so readings nearly identical to the
+                   last translated text of a source are dropped after OCR.
+                   Defaults to a budget of 2 differing characters. With a
+                   settle_time, new text is held on a timer and only passed
+                   on if no different reading replaced it meanwhile.
+        on_skip: Called with (job) when a frame is dropped as jitter
+        max_targets: Target languages translated concurrently per frame
+    """
+
+    def __init__(self, processor,
+                 on_ocr: Callable[[FrameJob, str], None],
+                 on_translation: Callable[[FrameJob, str, str, str], None],
+                 on_error: Callable[[FrameJob, str, Exception, Optional[str]], None],
+                 segment_mode: str = 'paragraph',
+                 stabilizer: Optional[TextStabilizer] = None,
+                 on_skip: Optional[Callable[[FrameJob], None]] = None,
+                 max_targets: int = 4):
+        self.processor = processor
+        self.translator = IncrementalTranslator(processor.translate_text, segment_mode,
+                                                processor.translate_batch)
+        self.on_ocr = on_ocr
+        self.on_translation = on_translation
+        self.on_error = on_error
+        self.on_skip = on_skip or (lambda job: None)
+        self.stabilizer = stabilizer or TextStabilizer()
+        self.languages: Tuple[str, str] = ("auto", "en")
+        self.target_langs: Tuple[str, ...] = ("en",)
+        self.max_targets = max_targets
+        self._fanout: Optional[ThreadPoolExecutor] = None
+        self.dropped_frames = 0
+        self._ocr_queue = LatestQueue()
+        self._translate_queue = LatestQueue()
+        self._running = False
+        self._threads = []
+        self._active: Dict[str, int] = {}
+        self._active_lock = threading.Lock()
+        self._detected: Dict[str, Optional[str]] = {}
+        self._profiles: Dict[str, OCRProfile] = {}
+
+    def set_languages(self, source_lang: str, target_langs: Union[str, Sequence[str]]):
+        """Set the languages used for frames submitted from now on.
+
+        Args:
+            source_lang: Source language code ('auto' for auto-detect)
+            target_langs: Target language code, or several to translate
+                          each frame into all of them
+        """
+        self.target_langs = _target_tuple(target_langs)
+        self.languages = (source_lang, self.target_langs[0])
+
+    def set_profile(self, key: str, profile: Optional[OCRProfile]):
+        """Set the tuned OCR settings used for frames from a source.
+
+        Args:
+            key: Source of the frames, e.g. a region name
+            profile: Tuned settings, or None to go back to the defaults
+        """
+        if profile is None:
+            self._profiles.pop(key, None)
+        else:
+            self._profiles[key] = profile
+
+    def reset(self, key: str):
+        """Forget everything remembered about a source.
+
+        A new source reusing the name, such as a re-drawn region, then has
+        its first frame translated in full.
+
+        Args:
+            key: Source of the frames, e.g. 'clipboard' or a region name
+        """
+        self.stabilizer.reset(key)
+        self.translator.reset(key)
+        self._detected.pop(key, None)
+        self._profiles.pop(key, None)
+
+    def start(self):
+        """Start the worker threads."""
+        if self._running:
+            return
+        self._running = True
+        # Separate from the translation client's own request pool, which
+        # the per-language tasks block on
+        self._fanout = ThreadPoolExecutor(max_workers=self.max_targets,
+                                          thread_name_prefix="translate-target")
+        self._threads = [
+            threading.Thread(target=self._ocr_loop, daemon=True),
+            threading.Thread(target=self._translate_loop, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stop the worker threads for good, discarding any waiting frames."""
+        self._running = False
+        self._ocr_queue.close()
+        self._translate_queue.close()
+        if self._fanout is not None:
+            self._fanout.shutdown(wait=False)
+
+    def submit(self, image: Image.Image, key: str = "clipboard",
+               source_lang: Optional[str] = None,
+               target_lang: Optional[Union[str, Sequence[str]]] = None) -> FrameJob:
+        """Queue a frame for processing.
+
+        A frame from the same source that is still waiting is replaced.
+
+        Args:
+            image: PIL Image to process
+            key: Source of the frame, e.g. 'clipboard' or a region name
+            source_lang: Source language override, or None for the default
+            target_lang: Target language(s) override, or None for the default
+
+        Returns:
+            The queued job
+        """
+        targets = _target_tuple(target_lang) if target_lang else self.target_langs
+        job = FrameJob(image, source_lang or self.languages[0], targets[0], key,
+                       target_langs=targets)
+        if self._ocr_queue.put(job, key):
+            self.dropped_frames += 1
+            metrics.increment('frames_dropped')
+        else:
+            self._track(key, 1)
+        return job
+
+    def is_busy(self, key: str) -> bool:
+        """Return whether a frame from the given source is queued or in progress.
+
+        Args:
+            key: Source of the frames, e.g. 'clipboard' or a region name
+        """
+        with self._active_lock:
+            return self._active.get(key, 0) > 0
+
+    def _track(self, key: str, delta: int):
+        """Adjust the count of frames being worked on for a source."""
+        with self._active_lock:
+            self._active[key] = self._active.get(key, 0) + delta
+
+    def _ocr_language(self, job: FrameJob) -> Optional[str]:
+        """Pick the Tesseract language pack for a job.
+        
+        A chosen source language decides it directly. With 'auto', the
+        language detected in the previous frame of the same source is used,
+        so a multi-language default such as 'eng+jpn' narrows to the one
+        pack actually on screen. None leaves the choice to the source's
+        profile or the processor default.
+        """
+        if job.source_lang != 'auto':
+            return self.processor.ocr_language(job.source_lang)
+        return self.processor.ocr_language(self._detected.get(job.key))
+
+    def _ocr_loop(self):
+        """OCR stage worker."""
+        while self._running:
+            job = self._ocr_queue.get()
+            if job is None:
+                continue
+            metrics.record('queue_wait', time.perf_counter() - job.submitted_at)
+            try:
+                with metrics.timer('ocr_stage'):
+                    job.text = self.processor.extract_text(job.image, self._ocr_language(job),
+                                                           self._profiles.get(job.key))
+            except Exception as e:
+                metrics.increment('errors_ocr')
+                self._track(job.key, -1)
+                self.on_error(job, "ocr", e, None)
+                continue
+
+            if job.source_lang == 'auto':
+                self._detected[job.key] = detect_language(job.text)
+
+            # Languages are part of the key so a language change always
+            # produces a fresh translation of the same text
+            key = self._stability_key(job)
+            if not self.stabilizer.update(key, job.text):
+                self._track(job.key, -1)
+                if self.stabilizer.settling(key, job.text):
+                    # Not tracked as busy meanwhile, so the monitor keeps
+                    # sending frames that may replace the settling text
+                    metrics.increment('frames_settling')
+                    timer = threading.Timer(self.stabilizer.settle_time, self._settled, (job,))
+                    timer.daemon = True
+                    timer.start()
+                else:
+                    metrics.increment('frames_unchanged')
+                    self.on_skip(job)
+                continue
+
+            self._pass_on(job)
+
+    def _settled(self, job: FrameJob):
+        """Pass on a job whose text stayed on screen for the settle time."""
+        if self._running and self.stabilizer.settle(self._stability_key(job), job.text):
+            self._track(job.key, 1)
+            self._pass_on(job)
+
+    def _pass_on(self, job: FrameJob):
+        """Report a job's new text and queue it for translation."""
+        self.on_ocr(job, job.text)
+        if not job.text.strip():
+            self.stabilizer.commit(self._stability_key(job), job.text)
+            self._track(job.key, -1)
+        elif self._translate_queue.put(job, job.key):
+            # The replaced job will never be translated
+            self._track(job.key, -1)
+            self.dropped_frames += 1
+            metrics.increment('frames_dropped')
+
+    @staticmethod
+    def _stability_key(job: FrameJob) -> Tuple:
+        """Key a job's text is compared under in the stabilizer."""
+        return (job.key, job.source_lang, job.target_langs)
+
+    def _translate_target(self, job: FrameJob, segments: List[str], separators: List[str],
+                          target_lang: str) -> bool:
+        """Translate a job's text into one target language and report it.
+
+        Returns:
+            True if the translation succeeded
+        """
+        try:
+            translation, detected_lang = self.translator.translate_split(
+                segments, separators, job.source_lang, target_lang, job.key
+            )
+        except Exception as e:
+            metrics.increment('errors_translate')
+            self.on_error(job, "translate", e, target_lang)
+            return False
+        metrics.record('pipeline', time.perf_counter() - job.submitted_at)
+        self.on_translation(job, translation, detected_lang, target_lang)
+        return True
+
+    def _translate_loop(self):
+        """Translation stage worker.
+
+        A job's target languages are translated concurrently and the next
+        job is only taken once all of them finished, so newer frames keep
+        replacing the waiting one meanwhile. The text is only committed to
+        the stabilizer once every language succeeded, so a failed
+        translation is retried when the same text is seen again.
+        """
+        while self._running:
+            job = self._translate_queue.get()
+            if job is None:
+                continue
+            succeeded = False
+            try:
+                with metrics.timer('translate_stage'):
+                    segments, separators = split_segments(job.text, self.translator.mode)
+                    if len(job.target_langs) == 1:
+                        succeeded = self._translate_target(job, segments, separators,
+                                                           job.target_lang)
+                    else:
+                        futures = [self._fanout.submit(self._translate_target, job, segments,
+                                                       separators, target_lang)
+                                   for target_lang in job.target_langs]
+                        wait(futures)
+                        succeeded = all(future.result() for future in futures)
+            except RuntimeError:
+                # The fan-out pool was shut down by stop()
+                pass
+            finally:
+                if succeeded:
+                    self.stabilizer.commit(self._stability_key(job), job.text)
+                else:
+                    self.stabilizer.release(self._stability_key(job), job.text)
+                self._track(job.key, -1)
@@ -0,0 +1,69 @@
+"""Adaptive scan scheduling.
+
+Instead of polling a region at a fixed interval, the scheduler polls
+quickly right after a change and backs off exponentially while the region
+stays static, so fast text updates are caught without re-grabbing a static
+screen many times a second.
+"""
+
+import threading
+
+
+class AdaptiveScheduler:
+    """Computes the delay before the next scan of a region.
+
+    Args:
+        min_interval: Shortest delay in seconds, used right after a change
+        max_interval: Longest delay in seconds, reached on a static screen
+        backoff: Factor the delay grows by after each static scan
+        busy_factor: Extra factor applied while the previous frame is still
+                     being processed
+    """
+
+    def __init__(self, min_interval: float = 0.5, max_interval: float = 5.0,
+                 backoff: float = 1.5, busy_factor: float = 2.0):
+        self.busy_factor = busy_factor
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self.set_bounds(min_interval, max_interval)
+
+    def set_bounds(self, min_interval: float, max_interval: float):
+        """Set the delay bounds and restart from the fastest rate.
+
+        Args:
+            min_interval: Shortest delay in seconds
+            max_interval: Longest delay in seconds
+        """
+        if min_interval <= 0:
+            raise ValueError("min_interval must be positive")
+        with self._lock:
+            self.min_interval = min_interval
+            self.max_interval = max(max_interval, min_interval)
+            self.interval = min_interval
+            self.delay = min_interval
+
+    def record(self, changed: bool, busy: bool = False) -> float:
+        """Record the outcome of a scan and return the delay before the next.
+
+        Args:
+            changed: Whether the scan found a change
+            busy: Whether OCR or translation is still working on an earlier
+                  frame from the same source
+
+        Returns:
+            Seconds to wait before the next scan
+        """
+        with self._lock:
+            if changed:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+            self.delay = self.interval
+            if busy:
+                self.delay = min(self.interval * self.busy_factor, self.max_interval)
+            return self.delay
+
+    @property
+    def rate(self) -> float:
+        """Current effective scan rate in scans per second."""
+        return 1.0 / self.delay
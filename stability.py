@@ -0,0 +1,230 @@
+"""Text stability filtering between OCR and translation.
+
+OCR of an unchanged subtitle often differs by a character or some
+whitespace from one frame to the next. Each source's output is compared
+line by line with the text last translated for it, and readings within a
+small edit budget are suppressed so they cause neither a translation
+request nor a redraw.
+"""
+
+import threading
+import time
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, Hashable, Optional
+
+from cache import normalize_text
+
+
+def normalize_ocr_text(text: str) -> str:
+    """Normalise OCR output for comparison.
+
+    Compatibility characters are folded (full-width forms, ligatures),
+    case is ignored and whitespace runs within a line collapse to one
+    space. Blank lines are dropped but line breaks are kept, so a line
+    added to a chat box is still a change.
+
+    Args:
+        text: Raw OCR output
+
+    Returns:
+        Normalised text, one line per non-blank input line
+    """
+    folded = unicodedata.normalize('NFKC', text).casefold()
+    lines = (normalize_text(line) for line in folded.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def edit_cost(a: str, b: str) -> Optional[int]:
+    """Count the characters that differ between two lines.
+
+    Returns:
+        Number of inserted, deleted or replaced characters, or None if a
+        digit is among them. Counters such as "100 gold" -> "900 gold" are
+        real updates however small the edit.
+    """
+    cost = 0
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            continue
+        changed = a[i1:i2] + b[j1:j2]
+        if any(ch.isdigit() for ch in changed):
+            return None
+        cost += max(i2 - i1, j2 - j1)
+    return cost
+
+
+def is_similar(a: str, b: str, max_edits: int) -> bool:
+    """Return whether b reads as OCR jitter of a.
+
+    Both texts must have the same number of lines, no digit may change and
+    at most max_edits characters may differ in total. The budget is
+    absolute rather than a ratio so that small real edits to long texts
+    still count as changes.
+    """
+    if a == b:
+        return True
+    lines_a, lines_b = a.split("\n"), b.split("\n")
+    if len(lines_a) != len(lines_b):
+        return False
+    total = 0
+    for line_a, line_b in zip(lines_a, lines_b):
+        if line_a == line_b:
+            continue
+        if abs(len(line_a) - len(line_b)) > max_edits - total:
+            return False
+        cost = edit_cost(line_a, line_b)
+        if cost is None:
+            return False
+        total += cost
+        if total > max_edits:
+            return False
+    return True
+
+
+class _SourceState:
+    """Committed, in-flight and settling text for one source."""
+
+    def __init__(self):
+        self.committed: Optional[str] = None
+        self.pending: Optional[str] = None
+        self.candidate: Optional[str] = None
+        self.since = 0.0
+
+
+class TextStabilizer:
+    """Decides which OCR results are real changes worth passing on.
+
+    A reading that passes is pending until commit() records that it was
+    translated; if translation fails, release() forgets it so the same
+    text is passed on again next time.
+
+    Args:
+        max_edits: Characters that may differ from the committed text for
+                   a reading to still count as the same text. 0 only
+                   suppresses readings that are identical after
+                   normalisation.
+        settle_time: Seconds a new text must stay on screen before it is
+                     passed on, e.g. to let typewriter-style subtitles finish.
+                     The monitors only send a frame when its pixels change,
+                     so settling is timed rather than counted in frames: the
+                     caller hands the reading to settle() once this much
+                     time has passed. 0 passes new text on immediately.
+    """
+
+    def __init__(self, max_edits: int = 2, settle_time: float = 0.0):
+        if max_edits < 0:
+            raise ValueError("max_edits must not be negative")
+        if settle_time < 0:
+            raise ValueError("settle_time must not be negative")
+        self.max_edits = max_edits
+        self.settle_time = settle_time
+        self._states: Dict[Hashable, _SourceState] = {}
+        self._lock = threading.Lock()
+
+    def _same(self, a: Optional[str], b: str) -> bool:
+        return a is not None and is_similar(a, b, self.max_edits)
+
+    def update(self, key: Hashable, text: str) -> bool:
+        """Record a reading and decide whether to pass it on.
+
+        Args:
+            key: Source of the reading, e.g. 'clipboard' or a region name
+            text: Raw OCR output
+
+        Returns:
+            True if the text should be translated, False if it is jitter of
+            the committed or in-flight text or has to settle first
+        """
+        normalized = normalize_ocr_text(text)
+        with self._lock:
+            state = self._states.setdefault(key, _SourceState())
+            if self._same(state.pending or state.committed, normalized):
+                state.candidate = None
+                return False
+
+            if self.settle_time > 0:
+                # A different reading restarts the clock; jitter of the
+                # settling text does not
+                if not self._same(state.candidate, normalized):
+                    state.candidate, state.since = normalized, time.monotonic()
+                return False
+
+            state.pending = normalized
+            return True
+
+    def settling(self, key: Hashable, text: str) -> bool:
+        """Return whether a reading is waiting to settle.
+
+        Args:
+            key: Source of the reading
+            text: Raw OCR output, as given to update()
+        """
+        normalized = normalize_ocr_text(text)
+        with self._lock:
+            state = self._states.get(key)
+            return state is not None and self._same(state.candidate, normalized)
+
+    def settle(self, key: Hashable, text: str) -> bool:
+        """Pass on a settling reading once it stayed for settle_time.
+
+        Args:
+            key: Source of the reading
+            text: Raw OCR output, as given to update()
+
+        Returns:
+            True if the text should be translated now, False if a different
+            reading replaced it or it has not been on screen long enough
+        """
+        normalized = normalize_ocr_text(text)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or not self._same(state.candidate, normalized):
+                return False
+            if time.monotonic() - state.since < self.settle_time:
+                return False
+            state.pending = normalized
+            state.candidate = None
+            return True
+
+    def commit(self, key: Hashable, text: str):
+        """Record that text passed on for a source was translated.
+
+        Args:
+            key: Source the text came from
+            text: Raw OCR output, as given to update()
+        """
+        normalized = normalize_ocr_text(text)
+        with self._lock:
+            state = self._states.setdefault(key, _SourceState())
+            state.committed = normalized
+            if state.pending == normalized:
+                state.pending = None
+
+    def release(self, key: Hashable, text: str):
+        """Forget text passed on for a source that could not be translated.
+
+        Args:
+            key: Source the text came from
+            text: Raw OCR output, as given to update()
+        """
+        normalized = normalize_ocr_text(text)
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and state.pending == normalized:
+                state.pending = None
+
+    def reset(self, key: Optional[Hashable] = None):
+        """Forget the committed text of one source, or of all sources.
+
+        Args:
+            key: Source to reset, or None for all. Tuple keys whose first
+                 item is key are reset too.
+        """
+        with self._lock:
+            if key is None:
+                self._states.clear()
+                return
+            for state_key in list(self._states):
+                if state_key == key or (isinstance(state_key, tuple) and state_key[:1] == (key,)):
+                    del self._states[state_key]
@@ -0,0 +1,194 @@
+"""Tile-based parallel OCR.
+
+Large frames are split into text-block tiles with a recursive XY-cut over
+the ink mask: the frame is cut along wide empty vertical gaps into columns,
+then each column along empty horizontal bands, and so on. The gaps needed
+are measured in lines of the frame's own text, so line spacing within a
+paragraph never splits it at any font size. Tiles come out in reading
+order, columns top to bottom from left to right, are recognised in
+parallel, and are cached by content, so when one block of a large region
+changes only that block is read again.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from change_detector import to_gray_array
+from preprocess import adaptive_threshold
+
+Box = Tuple[int, int, int, int]
+
+
+def _gaps(profile: np.ndarray, min_gap: int) -> List[Tuple[int, int]]:
+    """Split a 1D ink profile into runs separated by at least min_gap empty cells.
+
+    Returns:
+        List of (start, end) index ranges containing ink
+    """
+    ink = np.flatnonzero(profile)
+    if len(ink) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(ink) > min_gap)
+    starts = np.concatenate(([ink[0]], ink[breaks + 1]))
+    ends = np.concatenate((ink[breaks] + 1, [ink[-1] + 1]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def xy_cut(mask: np.ndarray, min_row_gap: int, min_col_gap: int,
+           origin: Tuple[int, int] = (0, 0)) -> List[Box]:
+    """Recursively split an ink mask into blocks in reading order.
+
+    Wide vertical gaps are cut first so columns are read top to bottom
+    before moving right, then horizontal gaps split each column into blocks.
+
+    Args:
+        mask: 2D boolean array, True where there is ink
+        min_row_gap: Empty rows needed to separate blocks vertically
+        min_col_gap: Empty columns needed to separate blocks horizontally
+        origin: Offset of mask within the full frame as (x, y)
+
+    Returns:
+        Boxes (x1, y1, x2, y2) in frame coordinates
+    """
+    ox, oy = origin
+    columns = _gaps(mask.any(axis=0), min_col_gap)
+    if len(columns) > 1:
+        return [box for x1, x2 in columns
+                for box in xy_cut(mask[:, x1:x2], min_row_gap, min_col_gap, (ox + x1, oy))]
+
+    rows = _gaps(mask.any(axis=1), min_row_gap)
+    if len(rows) > 1:
+        return [box for y1, y2 in rows
+                for box in xy_cut(mask[y1:y2], min_row_gap, min_col_gap, (ox, oy + y1))]
+
+    if not columns:
+        return []
+    (x1, x2), (y1, y2) = columns[0], rows[0]
+    return [(ox + x1, oy + y1, ox + x2, oy + y2)]
+
+
+def estimate_line_metrics(mask: np.ndarray, default: int) -> Tuple[int, int]:
+    """Estimate the height of text lines and the space between them.
+
+    Runs of rows containing ink are taken as lines; medians ignore the odd
+    rule, stray speck or paragraph break.
+
+    Args:
+        mask: 2D boolean array, True where there is ink
+        default: Line height returned when no lines are found
+
+    Returns:
+        (line height, gap between lines) in mask rows; the gap is 0 when
+        there are fewer than two lines
+    """
+    lines = [(start, end) for start, end in _gaps(mask.any(axis=1), 1) if end - start > 1]
+    if not lines:
+        return default, 0
+    height = int(np.median([end - start for start, end in lines]))
+    gaps = [start - end for (_, end), (start, _) in zip(lines, lines[1:])]
+    return height, int(np.median(gaps)) if gaps else 0
+
+
+def find_text_blocks(image, scale: int = 2, min_row_gap: Optional[int] = None,
+                     min_col_gap: Optional[int] = None, row_gap_lines: float = 1.0,
+                     col_gap_lines: float = 2.5, padding: int = 6,
+                     min_size: int = 8) -> List[Box]:
+    """Locate text blocks in a frame.
+
+    Args:
+        image: PIL Image or NumPy array
+        scale: Downsampling step used for layout analysis
+        min_row_gap: Empty pixel rows separating blocks vertically, or None
+                     to measure it from the text: row_gap_lines times the
+                     line height, or half as much again as the usual space
+                     between lines if that is larger (double-spaced text)
+        min_col_gap: Empty pixel columns separating blocks horizontally, or
+                     None to use col_gap_lines times the line height
+        row_gap_lines: Vertical gap, in text lines, that starts a new block
+        col_gap_lines: Horizontal gap, in text lines, that separates columns.
+                       Word spaces are well under one line height.
+        padding: Pixels added around each block
+        min_size: Blocks smaller than this in both dimensions are dropped as noise
+
+    Returns:
+        Boxes (x1, y1, x2, y2) in reading order
+    """
+    gray = to_gray_array(image)
+    height, width = gray.shape
+    small = np.ascontiguousarray(gray[::scale, ::scale])
+    if np.median(small) < 128:
+        small = 255 - small
+    mask = adaptive_threshold(small) == 0
+
+    line, line_gap = estimate_line_metrics(mask, default=max(20 // scale, 1))
+    if min_row_gap is not None:
+        row_gap = min_row_gap // scale
+    else:
+        row_gap = max(line * row_gap_lines, line_gap * 1.5)
+    col_gap = min_col_gap // scale if min_col_gap is not None else line * col_gap_lines
+    blocks = []
+    for x1, y1, x2, y2 in xy_cut(mask, max(int(row_gap), 1), max(int(col_gap), 1)):
+        if (x2 - x1) * scale < min_size and (y2 - y1) * scale < min_size:
+            continue
+        blocks.append((max(x1 * scale - padding, 0), max(y1 * scale - padding, 0),
+                       min(x2 * scale + padding, width), min(y2 * scale + padding, height)))
+    return blocks
+
+
+class TiledOCR:
+    """Runs OCR per text block on a thread pool and stitches the results.
+
+    Args:
+        workers: Number of tiles recognised concurrently
+        min_pixels: Frames with fewer pixels are not split
+        **layout: Options passed to find_text_blocks
+    """
+
+    def __init__(self, workers: int = 2, min_pixels: int = 400 * 300, **layout):
+        self.workers = workers
+        self.min_pixels = min_pixels
+        self.layout = layout
+        self.last_tile_count = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-tile")
+
+    def applies_to(self, image: Image.Image) -> bool:
+        """Return whether a frame is large enough to be split into tiles."""
+        width, height = image.size
+        return width * height >= self.min_pixels
+
+    def find_blocks(self, image: Image.Image) -> List[Box]:
+        """Locate the text blocks of a frame with this tiler's layout options."""
+        return find_text_blocks(image, **self.layout)
+
+    def extract_text(self, image: Image.Image,
+                     recognize: Callable[[Image.Image], str],
+                     blocks: Optional[List[Box]] = None) -> str:
+        """Recognise a frame tile by tile.
+
+        Args:
+            image: Frame to read
+            recognize: Function returning the text of one tile; it is expected
+                       to consult the content-addressed OCR cache, so tiles
+                       that did not change are not read again
+            blocks: Precomputed text blocks, or None to detect them
+
+        Returns:
+            Text of all tiles in reading order, one paragraph per tile
+        """
+        if blocks is None:
+            blocks = self.find_blocks(image)
+        self.last_tile_count = len(blocks)
+        if not blocks:
+            return ""
+
+        frame = np.asarray(image)
+        tiles = [Image.fromarray(frame[y1:y2, x1:x2]) for x1, y1, x2, y2 in blocks]
+        texts = list(self._executor.map(recognize, tiles))
+        return "\n\n".join(text.strip() for text in texts if text.strip())
+
+    def close(self):
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,264 @@
+"""HTTP translation client with batching, concurrency and backoff.
+
+Segments are packed into as few requests as the backend's size limit
+allows, requests share one keep-alive connection pool, and a bounded number
+of them run concurrently under a rate limit. Failed requests are retried
+with exponential backoff.
+
+requests, BeautifulSoup and deep_translator are imported when the first
+request is made, keeping them off the application's startup path.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Segments inside a batch are separated by a blank line, which the backend
+# keeps as a paragraph break in its output.
+BATCH_SEPARATOR = "\n\n"
+
+# Mobile Google Translate page, as used by deep_translator's GoogleTranslator
+GOOGLE_TRANSLATE_URL = "https://translate.google.com/m"
+
+
+class RateLimiter:
+    """Token bucket limiting how often requests may start.
+
+    Args:
+        rate: Requests allowed per second, or None for no limit
+        burst: Number of requests that may start back to back
+    """
+
+    def __init__(self, rate: Optional[float] = 5.0, burst: int = 5):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may start."""
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def pack_batches(segments: List[str], max_chars: int) -> List[List[int]]:
+    """Group segment indices into batches that fit the request size limit.
+
+    Args:
+        segments: Segments to send
+        max_chars: Maximum characters per request
+
+    Returns:
+        List of batches, each a list of indices into segments
+    """
+    batches = []
+    current: List[int] = []
+    size = 0
+    for i, segment in enumerate(segments):
+        extra = len(segment) + (len(BATCH_SEPARATOR) if current else 0)
+        if current and size + extra > max_chars:
+            batches.append(current)
+            current, size = [], 0
+            extra = len(segment)
+        current.append(i)
+        size += extra
+    if current:
+        batches.append(current)
+    return batches
+
+
+class TranslationClient:
+    """Google Translate client that reuses connections and batches requests.
+
+    If the backend once returns a batch without its segment boundaries,
+    batching is switched off for the rest of the session and every segment
+    is sent on its own, since each such batch would otherwise cost one
+    request more than sending the segments separately.
+
+    Args:
+        base_url: Translation endpoint; point it at a local stub for testing
+        max_chars: Maximum characters per request
+        max_concurrency: Maximum requests in flight at once
+        rate: Requests started per second, or None for no limit
+        max_retries: Retries for rate-limited or failed requests
+        backoff: Initial retry delay in seconds, doubled on each retry
+        max_backoff: Upper bound on the retry delay in seconds
+        timeout: Request timeout in seconds
+    """
+
+    def __init__(self, base_url: str = GOOGLE_TRANSLATE_URL, max_chars: int = 5000,
+                 max_concurrency: int = 4, rate: Optional[float] = 5.0, max_retries: int = 4,
+                 backoff: float = 0.5, max_backoff: float = 8.0, timeout: float = 10.0):
+        self.base_url = base_url
+        self.max_chars = max_chars
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.limiter = RateLimiter(rate, burst=max_concurrency)
+        self.requests_sent = 0
+        self.batching = True
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="translate")
+
+    @property
+    def session(self):
+        """Pooled HTTP session, created on first use."""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                        pool_maxsize=self.max_concurrency)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+
+    def connect(self):
+        """Open a pooled connection to the backend ahead of the first request.
+
+        Raises:
+            requests.RequestException: If the backend cannot be reached
+        """
+        self.session.head(self.base_url, timeout=self.timeout)
+
+    def _request(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Send a single translation request, retrying with backoff."""
+        import requests
+        from deep_translator.exceptions import RequestError, TooManyRequests
+
+        params = {'sl': source_lang, 'tl': target_lang, 'q': text}
+        for attempt in range(self.max_retries + 1):
+            with metrics.timer('translate_wait'):
+                self.limiter.acquire()
+            try:
+                with metrics.timer('translate_request'):
+                    response = self.session.get(self.base_url, params=params,
+                                                timeout=self.timeout)
+            except requests.RequestException:
+                metrics.increment('translate_retries')
+                if attempt == self.max_retries:
+                    raise RequestError()
+                self._sleep_backoff(attempt)
+                continue
+            self.requests_sent += 1
+
+            if response.status_code == 429 or response.status_code >= 500:
+                metrics.increment('translate_retries')
+                if attempt == self.max_retries:
+                    raise TooManyRequests() if response.status_code == 429 else RequestError()
+                self._sleep_backoff(attempt)
+                continue
+            if response.status_code != 200:
+                raise RequestError()
+            return self._parse(response.text, text)
+
+    def _sleep_backoff(self, attempt: int):
+        """Sleep for an exponentially growing, jittered delay."""
+        delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+        time.sleep(delay * random.uniform(0.5, 1.0))
+
+    @staticmethod
+    def _parse(html: str, text: str) -> str:
+        """Extract the translation from the endpoint's HTML response."""
+        from bs4 import BeautifulSoup
+        from deep_translator.exceptions import TranslationNotFound
+
+        soup = BeautifulSoup(html, "html.parser")
+        element = soup.find("div", {"class": "t0"}) or soup.find("div", {"class": "result-container"})
+        if element is None:
+            raise TranslationNotFound(text)
+        return element.get_text().strip()
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate a single piece of text.
+
+        Args:
+            text: Text to translate, at most max_chars long
+            source_lang: Source language code ('auto' for auto-detect)
+            target_lang: Target language code
+
+        Returns:
+            Translated text
+        """
+        if not text.strip():
+            return ""
+        return self._request(text.strip(), source_lang, target_lang)
+
+    def _translate_batch(self, segments: List[str], source_lang: str,
+                         target_lang: str) -> List[str]:
+        """Translate one packed batch, falling back to one request per segment
+        if the backend did not keep the segment boundaries."""
+        if len(segments) == 1:
+            return [self.translate(segments[0], source_lang, target_lang)]
+        translated = self._request(BATCH_SEPARATOR.join(segments), source_lang, target_lang)
+        parts = [part.strip() for part in translated.split(BATCH_SEPARATOR)]
+        if len(parts) == len(segments):
+            return parts
+        metrics.increment('translate_batch_fallbacks')
+        if self.batching:
+            self.batching = False
+            logger.warning("Translation backend merged %d batched segments into %d; "
+                           "sending segments one at a time from now on",
+                           len(segments), len(parts))
+        return [self.translate(segment, source_lang, target_lang) for segment in segments]
+
+    def translate_batch(self, segments: List[str], source_lang: str,
+                        target_lang: str) -> List[str]:
+        """Translate many segments using as few concurrent requests as possible.
+
+        Segments should not contain blank lines, as those separate segments
+        inside a request.
+
+        Args:
+            segments: Segments to translate
+            source_lang: Source language code ('auto' for auto-detect)
+            target_lang: Target language code
+
+        Returns:
+            Translations in the same order as segments
+        """
+        results = [""] * len(segments)
+        todo = [i for i, segment in enumerate(segments) if segment.strip()]
+        if self.batching:
+            batches = pack_batches([segments[i].strip() for i in todo], self.max_chars)
+        else:
+            batches = [[i] for i in range(len(todo))]
+        futures = [
+            (batch, self._executor.submit(
+                self._translate_batch, [segments[todo[i]].strip() for i in batch],
+                source_lang, target_lang))
+            for batch in batches
+        ]
+        for batch, future in futures:
+            for i, translation in zip(batch, future.result()):
+                results[todo[i]] = translation
+        return results
+
+    def close(self):
+        """Shut down the worker threads and close pooled connections."""
+        self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
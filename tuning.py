@@ -0,0 +1,214 @@
+"""Per-region Tesseract parameter tuning.
+
+Tesseract's defaults assume a full page of unknown layout in any installed
+language. A subtitle bar read as a single line (``--psm 7``) in one language
+is several times faster. When a region is first seen, a short calibration
+on one of its frames searches page segmentation mode, engine mode, upscale
+factor and language one parameter at a time, and keeps the fastest setting
+whose confidence is close to the best seen. Profiles are stored per region
+geometry so the next session loads them without calibrating again.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from language_id import TESSERACT_LANGS, detect_language, has_letters
+from paths import app_path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OCRProfile:
+    """Tesseract settings for one region.
+
+    Attributes:
+        lang: Tesseract language pack(s), or None for the processor default
+        psm: Page segmentation mode, or None for Tesseract's default
+        oem: OCR engine mode, or None for Tesseract's default
+        scale: Fixed upscale factor applied by the preprocessor, or None to
+               pick one per frame
+        confidence: Mean word confidence measured during calibration
+        seconds: OCR time measured during calibration
+    """
+
+    lang: Optional[str] = None
+    psm: Optional[int] = None
+    oem: Optional[int] = None
+    scale: Optional[float] = None
+    confidence: float = 0.0
+    seconds: float = 0.0
+
+    @property
+    def config(self) -> str:
+        """Tesseract command line options for this profile."""
+        options = []
+        if self.psm is not None:
+            options.append(f"--psm {self.psm}")
+        if self.oem is not None:
+            options.append(f"--oem {self.oem}")
+        return " ".join(options)
+
+
+def region_key(bbox: Tuple[int, int, int, int]) -> str:
+    """Return the key a region's profile is stored under."""
+    return ",".join(str(v) for v in bbox)
+
+
+class ProfileStore:
+    """Tuned profiles saved as JSON, keyed by region geometry.
+
+    Args:
+        path: JSON file to load from and save to. Defaults to
+              ~/.kiana/profiles.json.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or app_path('profiles.json')
+        self._profiles: Dict[str, OCRProfile] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self._profiles = {key: OCRProfile(**value) for key, value in data.items()}
+        except (OSError, ValueError, TypeError):
+            logger.exception("Error loading OCR profiles from %s", self.path)
+
+    def get(self, key: str) -> Optional[OCRProfile]:
+        """Return the saved profile for a region, if any."""
+        with self._lock:
+            return self._profiles.get(key)
+
+    def put(self, key: str, profile: OCRProfile):
+        """Save a region's profile, replacing any previous one."""
+        with self._lock:
+            self._profiles[key] = profile
+            self._save()
+
+    def _save(self):
+        """Write all profiles, replacing the file atomically."""
+        data = {k: asdict(v) for k, v in self._profiles.items()}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def remove(self, key: str):
+        """Drop a region's saved profile so it is calibrated again."""
+        with self._lock:
+            if self._profiles.pop(key, None) is not None:
+                self._save()
+
+
+class AutoTuner:
+    """Calibrates OCR settings on a sample frame.
+
+    Args:
+        processor: OCRProcessor whose engine and preprocessing are tuned
+        psms: Page segmentation modes to try; None is Tesseract's default
+        oems: Engine modes to try; modes whose data is not installed are skipped
+        scales: Fixed upscale factors to try; None picks one per frame
+        repeats: Timed runs per candidate, the fastest of which is kept
+        tolerance: Confidence points a candidate may lose against the best
+                   one and still win by being faster
+        min_confidence: Mean word confidence the winning profile needs to
+                        be kept
+    """
+
+    def __init__(self, processor, psms: Iterable[Optional[int]] = (None, 6, 7),
+                 oems: Iterable[Optional[int]] = (None, 0),
+                 scales: Iterable[Optional[float]] = (None, 1.0, 2.0),
+                 repeats: int = 2, tolerance: float = 5.0, min_confidence: float = 40.0):
+        self.processor = processor
+        self.psms = tuple(psms)
+        self.oems = tuple(oems)
+        self.scales = tuple(scales)
+        self.repeats = repeats
+        self.tolerance = tolerance
+        self.min_confidence = min_confidence
+
+    def _measure(self, image: Image.Image, profile: OCRProfile) -> Optional[OCRProfile]:
+        """Time a candidate, returning it with its scores or None if it fails."""
+        best = None
+        confidence = 0.0
+        try:
+            for _ in range(self.repeats):
+                start = time.perf_counter()
+                confidence = self.processor.measure_confidence(image, profile)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+        except Exception as e:
+            logger.debug("Skipping OCR candidate %s: %s", profile, e)
+            return None
+        return replace(profile, confidence=confidence, seconds=best)
+
+    def _pick(self, results: List[OCRProfile]) -> Optional[OCRProfile]:
+        """Return the fastest result whose confidence is close to the best."""
+        if not results:
+            return None
+        top = max(result.confidence for result in results)
+        good = [result for result in results if result.confidence >= top - self.tolerance]
+        return min(good, key=lambda result: result.seconds)
+
+    def _languages(self, text: str, default: str) -> List[str]:
+        """Candidate language packs: the default, its parts and the one text is in."""
+        candidates = [default] + [part for part in default.split('+') if part != default]
+        pack = TESSERACT_LANGS.get(detect_language(text) or '')
+        if pack and pack in self.processor.engine.languages() and pack not in candidates:
+            candidates.append(pack)
+        return candidates
+
+    def calibrate(self, image: Image.Image, lang: Optional[str] = None) -> Optional[OCRProfile]:
+        """Find fast settings that still read the sample frame well.
+
+        Parameters are searched one at a time (language, then page
+        segmentation, scale and engine mode), each starting from the best
+        settings found so far, so a calibration costs about a dozen OCR runs
+        rather than the full grid.
+
+        A frame without readable text would make every candidate score
+        zero and the fastest one win, so no profile is returned for it;
+        calibrate again on a later frame.
+
+        Args:
+            image: Representative frame of the region
+            lang: Language pack(s) to start from, or None for the default
+
+        Returns:
+            The winning profile, or None if the frame has no words or even
+            the best candidate reads it with less than min_confidence
+        """
+        current = OCRProfile(lang=lang or self.processor.lang)
+        text = self.processor.extract_text(image, current.lang)
+        if not has_letters(text):
+            logger.info("Not tuning OCR on a frame without text")
+            return None
+        steps = [
+            ('lang', self._languages(text, current.lang)),
+            ('psm', self.psms),
+            ('scale', self.scales if self.processor.preprocessor is not None else ()),
+            ('oem', self.oems),
+        ]
+        for field, values in steps:
+            results = [self._measure(image, replace(current, **{field: value}))
+                       for value in values]
+            best = self._pick([result for result in results if result is not None])
+            if best is not None:
+                current = best
+        if current.confidence < self.min_confidence:
+            logger.info("Not keeping OCR profile with low confidence: %s", current)
+            return None
+        logger.info("Tuned OCR profile: %s", current)
+        return current